@@ -1,18 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
 import uvicorn
 from fastapi import APIRouter, FastAPI
 
+from src.api.middleware import ConsistencyTokenMiddleware
+from src.api.v1_handlers.bulk import bulk_router
 from src.api.v1_handlers.dish import dish_router
 from src.api.v1_handlers.menu import menu_router
+from src.api.v1_handlers.search import search_router
+from src.api.v1_handlers.stats import stats_router
 from src.api.v1_handlers.submenu import submenu_router
 from src.core.config import settings
+from src.database.notify import listen_changes
+from src.database.redis_cache import close_redis, init_redis
+from src.database.session import db_helper
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    redis = init_redis()
+    listener = asyncio.create_task(redis.listen_invalidations())
+    changes_listener = asyncio.create_task(listen_changes(redis, settings.db.dsn))
+    yield
+    for task in (changes_listener, listener):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await db_helper.dispose()
+    await close_redis()
+
 
-app = FastAPI(title=settings.app.project_name)
+app = FastAPI(title=settings.app.project_name, lifespan=lifespan)
+app.add_middleware(ConsistencyTokenMiddleware)
 
 main_router = APIRouter(prefix='/api/v1')
 
+main_router.include_router(bulk_router)
 main_router.include_router(dish_router)
 main_router.include_router(menu_router)
 main_router.include_router(submenu_router)
+main_router.include_router(search_router)
+main_router.include_router(stats_router)
 
 app.include_router(main_router)
 
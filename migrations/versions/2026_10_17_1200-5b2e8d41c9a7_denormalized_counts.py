@@ -0,0 +1,134 @@
+"""Denormalized counts
+
+Revision ID: 5b2e8d41c9a7
+Revises: c71a89ff5675
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e8d41c9a7"
+down_revision: Union[str, None] = "c71a89ff5675"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "menu",
+        sa.Column("submenus_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "menu",
+        sa.Column("dishes_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "submenu",
+        sa.Column("dishes_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION submenu_counts() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE menu
+                SET submenus_count = submenus_count + 1,
+                    dishes_count = dishes_count + NEW.dishes_count
+                WHERE id = NEW.menu_id;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE menu
+                SET submenus_count = submenus_count - 1,
+                    dishes_count = dishes_count - OLD.dishes_count
+                WHERE id = OLD.menu_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION dish_counts() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE submenu SET dishes_count = dishes_count + 1 WHERE id = NEW.submenu_id;
+                UPDATE menu SET dishes_count = dishes_count + 1
+                WHERE id = (SELECT menu_id FROM submenu WHERE id = NEW.submenu_id);
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE submenu SET dishes_count = dishes_count - 1 WHERE id = OLD.submenu_id;
+                UPDATE menu SET dishes_count = dishes_count - 1
+                WHERE id = (SELECT menu_id FROM submenu WHERE id = OLD.submenu_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER submenu_counts AFTER INSERT OR DELETE ON submenu
+        FOR EACH ROW EXECUTE FUNCTION submenu_counts()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER submenu_counts_move AFTER UPDATE OF menu_id ON submenu
+        FOR EACH ROW WHEN (OLD.menu_id IS DISTINCT FROM NEW.menu_id)
+        EXECUTE FUNCTION submenu_counts()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER dish_counts AFTER INSERT OR DELETE ON dish
+        FOR EACH ROW EXECUTE FUNCTION dish_counts()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER dish_counts_move AFTER UPDATE OF submenu_id ON dish
+        FOR EACH ROW WHEN (OLD.submenu_id IS DISTINCT FROM NEW.submenu_id)
+        EXECUTE FUNCTION dish_counts()
+        """
+    )
+    op.execute(
+        """
+        UPDATE submenu SET dishes_count = counts.dishes
+        FROM (
+            SELECT submenu.id, count(dish.id) AS dishes
+            FROM submenu LEFT JOIN dish ON dish.submenu_id = submenu.id
+            GROUP BY submenu.id
+        ) AS counts
+        WHERE submenu.id = counts.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE menu SET submenus_count = counts.submenus, dishes_count = counts.dishes
+        FROM (
+            SELECT menu.id, count(submenu.id) AS submenus,
+                   coalesce(sum(submenu.dishes_count), 0) AS dishes
+            FROM menu LEFT JOIN submenu ON submenu.menu_id = menu.id
+            GROUP BY menu.id
+        ) AS counts
+        WHERE menu.id = counts.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER dish_counts_move ON dish")
+    op.execute("DROP TRIGGER dish_counts ON dish")
+    op.execute("DROP TRIGGER submenu_counts_move ON submenu")
+    op.execute("DROP TRIGGER submenu_counts ON submenu")
+    op.execute("DROP FUNCTION dish_counts()")
+    op.execute("DROP FUNCTION submenu_counts()")
+    op.drop_column("submenu", "dishes_count")
+    op.drop_column("menu", "dishes_count")
+    op.drop_column("menu", "submenus_count")
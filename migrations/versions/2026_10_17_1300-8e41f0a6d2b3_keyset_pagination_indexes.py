@@ -0,0 +1,27 @@
+"""Keyset pagination indexes
+
+Revision ID: 8e41f0a6d2b3
+Revises: 5b2e8d41c9a7
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e41f0a6d2b3"
+down_revision: Union[str, None] = "5b2e8d41c9a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_submenu_menu_id_id", "submenu", ["menu_id", "id"])
+    op.create_index("ix_dish_submenu_id_id", "dish", ["submenu_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dish_submenu_id_id", table_name="dish")
+    op.drop_index("ix_submenu_menu_id_id", table_name="submenu")
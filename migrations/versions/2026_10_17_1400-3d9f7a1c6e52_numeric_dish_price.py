@@ -0,0 +1,42 @@
+"""Numeric dish price
+
+Revision ID: 3d9f7a1c6e52
+Revises: 8e41f0a6d2b3
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d9f7a1c6e52"
+down_revision: Union[str, None] = "8e41f0a6d2b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "dish",
+        "price",
+        type_=sa.Numeric(10, 2),
+        existing_type=sa.String(),
+        existing_nullable=False,
+        postgresql_using="replace(price, ',', '.')::numeric(10, 2)",
+    )
+    op.create_index("ix_dish_submenu_id_price_id", "dish", ["submenu_id", "price", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dish_submenu_id_price_id", table_name="dish")
+    op.alter_column(
+        "dish",
+        "price",
+        type_=sa.String(),
+        existing_type=sa.Numeric(10, 2),
+        existing_nullable=False,
+        postgresql_using="price::text",
+    )
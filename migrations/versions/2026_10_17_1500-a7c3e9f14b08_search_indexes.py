@@ -0,0 +1,54 @@
+"""Full-text and trigram search indexes
+
+Revision ID: a7c3e9f14b08
+Revises: 3d9f7a1c6e52
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f14b08"
+down_revision: Union[str, None] = "3d9f7a1c6e52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("menu", "submenu", "dish")
+SEARCH_VECTOR = "to_tsvector('russian', title || ' ' || description)"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(SEARCH_VECTOR, persisted=True),
+            ),
+        )
+        op.create_index(
+            f"ix_{table}_search_vector", table, ["search_vector"], postgresql_using="gin"
+        )
+        for column in ("title", "description"):
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_index(f"ix_{table}_description_trgm", table_name=table)
+        op.drop_index(f"ix_{table}_title_trgm", table_name=table)
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
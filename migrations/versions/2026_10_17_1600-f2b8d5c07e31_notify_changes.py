@@ -0,0 +1,81 @@
+"""Notify cache invalidation listener about row changes
+
+Revision ID: f2b8d5c07e31
+Revises: a7c3e9f14b08
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d5c07e31"
+down_revision: Union[str, None] = "a7c3e9f14b08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("menu", "submenu", "dish")
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_change(entity text, data jsonb) RETURNS void AS $$
+        BEGIN
+            IF entity = 'dish' THEN
+                data := data || jsonb_build_object(
+                    'menu_id', (SELECT menu_id FROM submenu WHERE id = (data ->> 'submenu_id')::uuid)
+                );
+            END IF;
+            PERFORM pg_notify('menu_changes', jsonb_build_object(
+                'table', entity,
+                'id', data -> 'id',
+                'menu_id', data -> 'menu_id',
+                'submenu_id', data -> 'submenu_id'
+            )::text);
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_LEVEL = 'STATEMENT' THEN
+                PERFORM pg_notify('menu_changes', json_build_object('table', TG_TABLE_NAME, 'truncate', true)::text);
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM notify_change(TG_TABLE_NAME, to_jsonb(OLD));
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM notify_change(TG_TABLE_NAME, to_jsonb(NEW));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_changes()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify_truncate AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_changes()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.execute(f"DROP TRIGGER {table}_notify_truncate ON {table}")
+        op.execute(f"DROP TRIGGER {table}_notify ON {table}")
+    op.execute("DROP FUNCTION notify_changes()")
+    op.execute("DROP FUNCTION notify_change(text, jsonb)")
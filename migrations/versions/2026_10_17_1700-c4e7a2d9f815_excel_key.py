@@ -0,0 +1,35 @@
+"""Mark rows owned by the Excel sync
+
+Revision ID: c4e7a2d9f815
+Revises: f2b8d5c07e31
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e7a2d9f815"
+down_revision: Union[str, None] = "f2b8d5c07e31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("menu", "submenu", "dish")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column("excel_key", sa.String(), nullable=True))
+        op.create_index(f"ix_{table}_excel_key", table, ["excel_key"], unique=True)
+        # The old loader replaced whole tables on every sync, so existing rows belong
+        # to the workbook: the next sync deletes them and inserts rows with stable ids.
+        op.execute(f"UPDATE {table} SET excel_key = 'legacy/' || id")
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_index(f"ix_{table}_excel_key", table_name=table)
+        op.drop_column(table, "excel_key")
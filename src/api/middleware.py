@@ -0,0 +1,23 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.consistency import CONSISTENCY_HEADER, issue_token
+
+
+class ConsistencyTokenMiddleware:
+    # Plain ASGI rather than BaseHTTPMiddleware: the response is passed through untouched,
+    # without the extra task and body re-streaming on every request.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_token(message: Message) -> None:
+            if message['type'] == 'http.response.start' and message['status'] < 400:
+                MutableHeaders(scope=message).append(CONSISTENCY_HEADER, issue_token())
+            await send(message)
+
+        await self.app(scope, receive, send_with_token)
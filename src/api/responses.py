@@ -0,0 +1,26 @@
+from email.utils import formatdate
+from typing import Any
+
+from fastapi import Response, status
+
+from src.core.config import settings
+from src.database.redis_cache import CacheResult
+
+
+def cache_headers(result: CacheResult) -> dict[str, str]:
+    headers = {'ETag': result.etag, 'Cache-Control': settings.app.cache_control}
+    if result.last_modified is not None:
+        headers['Last-Modified'] = formatdate(result.last_modified, usegmt=True)
+    if result.next_cursor is not None:
+        headers['X-Next-Cursor'] = result.next_cursor
+    return headers
+
+
+def cached_response(result: CacheResult, response: Response) -> Any:
+    headers = cache_headers(result)
+    if result.not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if isinstance(result.value, (str, bytes)):
+        return Response(content=result.value, media_type='application/json', headers=headers)
+    response.headers.update(headers)
+    return result.value
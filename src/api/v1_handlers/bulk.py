@@ -0,0 +1,121 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends, Path, status
+
+from src.core.config import settings
+from src.schemas.bulk import BulkResult
+from src.schemas.dish import DishBulkUpdate, DishCreate, DishResponse
+from src.schemas.menu import MenuBulkUpdate, MenuCreate, MenuResponse
+from src.schemas.submenu import SubmenuBulkUpdate, SubmenuCreate, SubmenuResponse
+from src.service.dish import DishService, get_dish_service
+from src.service.menu import MenuService, get_menu_service
+from src.service.submenu import SubmenuService, get_submenu_service
+
+bulk_router = APIRouter(tags=['Bulk'])
+
+BulkBody = Body(max_length=settings.app.bulk_max_items)
+
+
+@bulk_router.post(
+    '/menus/bulk/',
+    response_model=list[MenuResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_menus(
+        body: Annotated[list[MenuCreate], BulkBody],
+        menu_service: MenuService = Depends(get_menu_service),
+) -> list[MenuResponse]:
+    return await menu_service.create_menus(body)
+
+
+@bulk_router.patch('/menus/bulk/', response_model=list[BulkResult])
+async def update_menus(
+        body: Annotated[list[MenuBulkUpdate], BulkBody],
+        menu_service: MenuService = Depends(get_menu_service),
+) -> list[BulkResult]:
+    return await menu_service.update_menus(
+        [item.model_dump(exclude_none=True) for item in body]
+    )
+
+
+@bulk_router.delete('/menus/bulk/', response_model=list[BulkResult])
+async def delete_menus(
+        body: Annotated[list[UUID], BulkBody],
+        menu_service: MenuService = Depends(get_menu_service),
+) -> list[BulkResult]:
+    return await menu_service.delete_menus(body)
+
+
+@bulk_router.post(
+    '/menus/{menu_id}/submenus/bulk/',
+    response_model=list[SubmenuResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_submenus(
+        menu_id: Annotated[UUID, Path()],
+        body: Annotated[list[SubmenuCreate], BulkBody],
+        submenu_service: SubmenuService = Depends(get_submenu_service),
+) -> list[SubmenuResponse]:
+    return await submenu_service.create_submenus(menu_id, body)
+
+
+@bulk_router.patch('/menus/{menu_id}/submenus/bulk/', response_model=list[BulkResult])
+async def update_submenus(
+        menu_id: Annotated[UUID, Path()],
+        body: Annotated[list[SubmenuBulkUpdate], BulkBody],
+        submenu_service: SubmenuService = Depends(get_submenu_service),
+) -> list[BulkResult]:
+    return await submenu_service.update_submenus(
+        menu_id, [item.model_dump(exclude_none=True) for item in body]
+    )
+
+
+@bulk_router.delete('/menus/{menu_id}/submenus/bulk/', response_model=list[BulkResult])
+async def delete_submenus(
+        menu_id: Annotated[UUID, Path()],
+        body: Annotated[list[UUID], BulkBody],
+        submenu_service: SubmenuService = Depends(get_submenu_service),
+) -> list[BulkResult]:
+    return await submenu_service.delete_submenus(menu_id, body)
+
+
+@bulk_router.post(
+    '/menus/{menu_id}/submenus/{submenu_id}/dishes/bulk/',
+    response_model=list[DishResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_dishes(
+        menu_id: Annotated[UUID, Path()],
+        submenu_id: Annotated[UUID, Path()],
+        body: Annotated[list[DishCreate], BulkBody],
+        dish_service: DishService = Depends(get_dish_service),
+) -> list[DishResponse]:
+    return await dish_service.create_dishes(menu_id, submenu_id, body)
+
+
+@bulk_router.patch(
+    '/menus/{menu_id}/submenus/{submenu_id}/dishes/bulk/',
+    response_model=list[BulkResult],
+)
+async def update_dishes(
+        submenu_id: Annotated[UUID, Path()],
+        body: Annotated[list[DishBulkUpdate], BulkBody],
+        dish_service: DishService = Depends(get_dish_service),
+) -> list[BulkResult]:
+    return await dish_service.update_dishes(
+        submenu_id, [item.model_dump(exclude_none=True) for item in body]
+    )
+
+
+@bulk_router.delete(
+    '/menus/{menu_id}/submenus/{submenu_id}/dishes/bulk/',
+    response_model=list[BulkResult],
+)
+async def delete_dishes(
+        menu_id: Annotated[UUID, Path()],
+        submenu_id: Annotated[UUID, Path()],
+        body: Annotated[list[UUID], BulkBody],
+        dish_service: DishService = Depends(get_dish_service),
+) -> list[BulkResult]:
+    return await dish_service.delete_dishes(menu_id, submenu_id, body)
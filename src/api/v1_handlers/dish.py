@@ -1,18 +1,21 @@
+from decimal import Decimal
 from typing import Annotated, Any
 from uuid import UUID
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
+    Header,
     HTTPException,
     Path,
     Query,
+    Response,
     status,
 )
 
-from src.schemas.dish import DishCreate, DishResponse, DishUpdate
-from src.service.dish import DishService, get_dish_service
+from src.api.responses import cached_response
+from src.schemas.dish import DishCreate, DishResponse, DishSort, DishUpdate
+from src.service.dish import DishService, get_dish_read_service, get_dish_service
 
 dish_router = APIRouter(tags=['Dish'])
 
@@ -22,12 +25,25 @@ dish_router = APIRouter(tags=['Dish'])
     response_model=list[DishResponse],
 )
 async def get_dishes(
+    menu_id: Annotated[UUID, Path()],
     submenu_id: Annotated[UUID, Path()],
+    response: Response,
     offset: Annotated[int, Query()] = 0,
     limit: Annotated[int, Query()] = 50,
-    dish_service: DishService = Depends(get_dish_service),
+    cursor: Annotated[str | None, Query()] = None,
+    min_price: Annotated[Decimal | None, Query()] = None,
+    max_price: Annotated[Decimal | None, Query()] = None,
+    sort: Annotated[DishSort, Query()] = 'id',
+    if_none_match: Annotated[str | None, Header()] = None,
+    dish_service: DishService = Depends(get_dish_read_service),
 ) -> list[DishResponse] | None | Exception | Any:
-    return await dish_service.get_dish_list(submenu_id, offset, limit)
+    return cached_response(
+        await dish_service.get_dish_list(
+            menu_id, submenu_id, offset, limit, cursor=cursor, if_none_match=if_none_match,
+            min_price=min_price, max_price=max_price, sort=sort,
+        ),
+        response,
+    )
 
 
 @dish_router.get(
@@ -35,11 +51,16 @@ async def get_dishes(
     response_model=DishResponse,
 )
 async def get_dish(
+    menu_id: Annotated[UUID, Path()],
     submenu_id: Annotated[UUID, Path()],
     dish_id: Annotated[UUID, Path()],
-    dish_service: DishService = Depends(get_dish_service),
-) -> DishResponse | Exception:
-    return await dish_service.get_dish(submenu_id, dish_id)
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+    dish_service: DishService = Depends(get_dish_read_service),
+) -> DishResponse | Exception | Response:
+    return cached_response(
+        await dish_service.get_dish(menu_id, submenu_id, dish_id, if_none_match), response
+    )
 
 
 @dish_router.post(
@@ -51,10 +72,9 @@ async def create_dish(
     menu_id: Annotated[UUID, Path()],
     submenu_id: Annotated[UUID, Path()],
     dish_body: DishCreate,
-    back_tasks: BackgroundTasks,
     dish_service: DishService = Depends(get_dish_service),
 ) -> DishResponse:
-    return await dish_service.create_dish(menu_id, submenu_id, dish_body, back_tasks)
+    return await dish_service.create_dish(menu_id, submenu_id, dish_body)
 
 
 @dish_router.patch(
@@ -65,7 +85,6 @@ async def update_dish(
     submenu_id: Annotated[UUID, Path()],
     dish_id: Annotated[UUID, Path()],
     dish_body: DishUpdate,
-    back_tasks: BackgroundTasks,
     dish_service: DishService = Depends(get_dish_service),
 ) -> DishResponse | Exception:
     dish: dict[str, str] = dish_body.model_dump(exclude_none=True)
@@ -74,7 +93,7 @@ async def update_dish(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail='Нужно заполнить хотябы одно поле',
         )
-    return await dish_service.update_dish(submenu_id, dish_id, dish, back_tasks)
+    return await dish_service.update_dish(submenu_id, dish_id, dish)
 
 
 @dish_router.delete(
@@ -85,10 +104,9 @@ async def delete_dish(
     menu_id: Annotated[UUID, Path()],
     submenu_id: Annotated[UUID, Path()],
     dish_id: Annotated[UUID, Path()],
-    back_tasks: BackgroundTasks,
     dish_service: DishService = Depends(get_dish_service),
 ) -> dict[str, str | bool] | None:
-    dish_deleted_id = await dish_service.delete_dish(menu_id, submenu_id, dish_id, back_tasks)
+    dish_deleted_id = await dish_service.delete_dish(menu_id, submenu_id, dish_id)
     if dish_deleted_id is not None:
         return {'status': True, 'message': 'The dish has been deleted'}
     return None
@@ -1,60 +1,70 @@
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
+    Header,
     HTTPException,
     Path,
     Query,
+    Response,
     status,
 )
+from fastapi.responses import StreamingResponse
 from sqlalchemy import ScalarResult
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.api.responses import cached_response
+from src.database.session import db_helper
 from src.schemas.menu import (
     MenuCreate,
     MenuResponse,
     MenuSubmenuDishResponse,
     MenuUpdate,
 )
-from src.service.menu import MenuService, get_menu_service
+from src.service.menu import MenuService, get_menu_read_service, get_menu_service
 
 menu_router = APIRouter(tags=['Menu'])
 
 
 @menu_router.get('/menus/', response_model=list[MenuResponse])
 async def get_menus(
+        response: Response,
         offset: Annotated[int, Query()] = 0,
         limit: Annotated[int, Query()] = 50,
-        menu_service: MenuService = Depends(get_menu_service),
-) -> None | Exception | ScalarResult | list[MenuResponse]:
-    return await menu_service.get_menus_list(offset, limit)
+        cursor: Annotated[str | None, Query()] = None,
+        if_none_match: Annotated[str | None, Header()] = None,
+        menu_service: MenuService = Depends(get_menu_read_service),
+) -> None | Exception | ScalarResult | list[MenuResponse] | Response:
+    return cached_response(
+        await menu_service.get_menus_list(offset, limit, cursor=cursor, if_none_match=if_none_match), response
+    )
 
 
 @menu_router.get('/menus/{menu_id}/', response_model=MenuResponse)
 async def get_menu(
         menu_id: Annotated[UUID, Path()],
-        menu_service: MenuService = Depends(get_menu_service),
-) -> MenuResponse | Exception:
-    return await menu_service.get_menu(menu_id)
+        response: Response,
+        if_none_match: Annotated[str | None, Header()] = None,
+        menu_service: MenuService = Depends(get_menu_read_service),
+) -> MenuResponse | Exception | Response:
+    return cached_response(await menu_service.get_menu(menu_id, if_none_match), response)
 
 
 @menu_router.post(
     '/menus/', response_model=MenuResponse, status_code=status.HTTP_201_CREATED
 )
 async def create_menu(
-        back_tasks: BackgroundTasks,
         body: MenuCreate, menu_service: MenuService = Depends(get_menu_service),
 ) -> MenuResponse | Exception:
-    return await menu_service.create_menu(body, back_tasks)
+    return await menu_service.create_menu(body)
 
 
 @menu_router.patch('/menus/{menu_id}/', response_model=MenuResponse)
 async def update_menu(
         menu_id: Annotated[UUID, Path()],
         body: MenuUpdate,
-        back_tasks: BackgroundTasks,
         menu_service: MenuService = Depends(get_menu_service),
 ) -> MenuResponse | Exception:
     menu_body: dict[str, str] = body.model_dump(exclude_none=True)
@@ -63,7 +73,7 @@ async def update_menu(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail='Для обновления нужно ввести хотябы одно поле',
         )
-    return await menu_service.update_menu(menu_id, menu_body, back_tasks)
+    return await menu_service.update_menu(menu_id, menu_body)
 
 
 @menu_router.delete(
@@ -72,18 +82,40 @@ async def update_menu(
 )
 async def delete_menu(
         menu_id: Annotated[UUID, Path()],
-        back_tasks: BackgroundTasks,
         menu_service: MenuService = Depends(get_menu_service),
 ) -> dict[str, str | bool] | Exception | None:
-    menu_deleted_id = await menu_service.delete_menu(menu_id, back_tasks)
+    menu_deleted_id = await menu_service.delete_menu(menu_id)
     if menu_deleted_id is not None:
         return {'status': True, 'message': 'The menu has been deleted'}
     return None
 
 
+STREAM_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+@menu_router.get('/full_menus_submenus_dishes/stream/', response_class=StreamingResponse)
+async def stream_full_menus_submenus_dishes(
+        offset: Annotated[int, Query()] = 0,
+        limit: Annotated[int | None, Query()] = None,
+        fmt: Annotated[Literal['ndjson', 'json'], Query(alias='format')] = 'ndjson',
+        session_factory: async_sessionmaker[AsyncSession] = Depends(db_helper.read_sessionmaker_dependency),
+        menu_service: MenuService = Depends(get_menu_read_service)) -> StreamingResponse:
+    return StreamingResponse(
+        menu_service.stream_full_menus_submenus_dishes(session_factory, offset, limit, array=fmt == 'json'),
+        media_type=STREAM_MEDIA_TYPES[fmt],
+    )
+
+
 @menu_router.get('/full_menus_submenus_dishes/', response_model=list[MenuSubmenuDishResponse])
 async def get_full_menus_submenus_dishes(
+        response: Response,
         offset: Annotated[int, Query()] = 0,
         limit: Annotated[int, Query()] = 50,
-        menu_service: MenuService = Depends(get_menu_service)):
-    return await menu_service.full_menus_submenus_dishes(offset, limit)
+        if_none_match: Annotated[str | None, Header()] = None,
+        menu_service: MenuService = Depends(get_menu_read_service)):
+    return cached_response(
+        await menu_service.full_menus_submenus_dishes(offset, limit, if_none_match), response
+    )
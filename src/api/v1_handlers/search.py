@@ -0,0 +1,21 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+
+from src.api.responses import cached_response
+from src.schemas.search import SearchHit
+from src.service.search import SearchService, get_search_read_service
+
+search_router = APIRouter(tags=['Search'])
+
+
+@search_router.get('/search/', response_model=list[SearchHit])
+async def search(
+        response: Response,
+        q: Annotated[str, Query(min_length=1, max_length=200)],
+        offset: Annotated[int, Query()] = 0,
+        limit: Annotated[int, Query()] = 50,
+        if_none_match: Annotated[str | None, Header()] = None,
+        search_service: SearchService = Depends(get_search_read_service),
+) -> list[SearchHit] | Response:
+    return cached_response(await search_service.search(q, offset, limit, if_none_match), response)
@@ -0,0 +1,12 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from src.database.session import db_helper
+
+stats_router = APIRouter(tags=['Stats'])
+
+
+@stats_router.get('/stats/pool/', response_model=dict[str, Any])
+async def get_pool_stats() -> dict[str, Any]:
+    return db_helper.pool_stats()
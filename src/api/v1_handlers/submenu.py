@@ -3,16 +3,22 @@ from uuid import UUID
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
+    Header,
     HTTPException,
     Path,
     Query,
+    Response,
     status,
 )
 
+from src.api.responses import cached_response
 from src.schemas.submenu import SubmenuCreate, SubmenuResponse, SubmenuUpdate
-from src.service.submenu import SubmenuService, get_submenu_service
+from src.service.submenu import (
+    SubmenuService,
+    get_submenu_read_service,
+    get_submenu_service,
+)
 
 submenu_router = APIRouter(tags=['Submenu'])
 
@@ -23,11 +29,19 @@ submenu_router = APIRouter(tags=['Submenu'])
 )
 async def get_submenus(
     menu_id: Annotated[UUID, Path()],
+    response: Response,
     offset: Annotated[int, Query()] = 0,
     limit: Annotated[int, Query()] = 50,
-    submenu_servie: SubmenuService = Depends(get_submenu_service),
-) -> list[SubmenuResponse] | Exception | None:
-    return await submenu_servie.get_submenus_list(menu_id, offset, limit)
+    cursor: Annotated[str | None, Query()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+    submenu_servie: SubmenuService = Depends(get_submenu_read_service),
+) -> list[SubmenuResponse] | Exception | None | Response:
+    return cached_response(
+        await submenu_servie.get_submenus_list(
+            menu_id, offset, limit, cursor=cursor, if_none_match=if_none_match
+        ),
+        response,
+    )
 
 
 @submenu_router.get(
@@ -37,9 +51,13 @@ async def get_submenus(
 async def get_submenu(
     menu_id: Annotated[UUID, Path()],
     submenu_id: Annotated[UUID, Path()],
-    submenu_service: SubmenuService = Depends(get_submenu_service),
-) -> SubmenuResponse | Exception:
-    return await submenu_service.get_submenu(menu_id, submenu_id)
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+    submenu_service: SubmenuService = Depends(get_submenu_read_service),
+) -> SubmenuResponse | Exception | Response:
+    return cached_response(
+        await submenu_service.get_submenu(menu_id, submenu_id, if_none_match), response
+    )
 
 
 @submenu_router.post(
@@ -50,10 +68,9 @@ async def get_submenu(
 async def create_submenu(
     menu_id: Annotated[UUID, Path()],
     submenu: SubmenuCreate,
-    back_tasks: BackgroundTasks,
     submenu_service: SubmenuService = Depends(get_submenu_service),
 ) -> SubmenuResponse:
-    return await submenu_service.create_submenu(menu_id, submenu, back_tasks)
+    return await submenu_service.create_submenu(menu_id, submenu)
 
 
 @submenu_router.patch(
@@ -63,7 +80,6 @@ async def update_submenu(
     menu_id: Annotated[UUID, Path()],
     submenu_id: Annotated[UUID, Path()],
     submenu: SubmenuUpdate,
-    back_tasks: BackgroundTasks,
     submenu_service: SubmenuService = Depends(get_submenu_service),
 ) -> SubmenuResponse | Exception:
     submenu_update: dict[str, str] = submenu.model_dump(exclude_none=True)
@@ -73,7 +89,7 @@ async def update_submenu(
             detail='Нужно заполнить хотябы одно поле',
         )
     return await submenu_service.update_submenu(
-        menu_id, submenu_id, submenu_update, back_tasks
+        menu_id, submenu_id, submenu_update
     )
 
 
@@ -84,11 +100,10 @@ async def update_submenu(
 async def delete_submenu(
     menu_id: Annotated[UUID, Path()],
     submenu_id: Annotated[UUID, Path()],
-    back_tasks: BackgroundTasks,
     submenu_service: SubmenuService = Depends(get_submenu_service),
 ) -> dict[str, bool | str] | None:
     submenu_id_deleted = await submenu_service.delete_submenu(
-        menu_id, submenu_id, back_tasks
+        menu_id, submenu_id
     )
     if submenu_id_deleted is not None:
         return {'status': True, 'message': 'The submenu has been deleted'}
@@ -9,6 +9,11 @@ BASE_DIR = Path(__name__).parent.parent.parent
 
 class AppSettings(BaseSettings):
     project_name: str = 'Тестовое Y_LAB'
+    cache_control: str = 'no-cache'
+    bulk_max_items: int = 1000
+    full_tree_engine: str = 'json'
+    stream_batch_size: int = 50
+    read_backend: str = 'orm'
 
 
 class DatabaseSettings(BaseSettings):
@@ -21,6 +26,17 @@ class DatabaseSettings(BaseSettings):
     port: int
     host: str
     echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 10.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    connect_timeout: float = 10.0
+    command_timeout: float | None = 30.0
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
+    replica_urls: list[str] = []
+    replica_lag: float = 5.0
 
     def _url(self) -> str:
         return (
@@ -33,6 +49,10 @@ class DatabaseSettings(BaseSettings):
     def async_url(self) -> str:
         return self._url()
 
+    @property
+    def dsn(self) -> str:
+        return self._url().replace('+asyncpg', '', 1)
+
 
 class DatabaseTestSettings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -64,6 +84,22 @@ class RedisSettings(BaseSettings):
     port: int
     password: SecretStr
     expire_in_sec: int
+    key_prefix: str = 'menu_app'
+    max_connections: int = 50
+    socket_timeout: float = 5.0
+    socket_connect_timeout: float = 5.0
+    local_cache_size: int = 10000
+    local_cache_ttl: float = 5.0
+    local_cache_max_bytes: int | None = 64 * 1024 * 1024
+    invalidation_channel: str = 'cache_invalidation'
+    distributed_lock: bool = False
+    lock_timeout: float = 10.0
+    stale_while_revalidate: dict[str, float] = {
+        'menu_list': 300,
+        'full_menus_submenus_dishes': 300,
+    }
+    codec: str = 'orjson'
+    raw_responses: bool = True
 
     def _url(self) -> str:
         return (
@@ -0,0 +1,15 @@
+from typing import Any
+
+from sqlalchemy import column, func, values
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.expression import Values
+
+
+def bulk_values(bodies: list[dict[str, Any]], *columns: InstrumentedAttribute) -> Values:
+    return values(
+        *[column(attr.key, attr.type) for attr in columns], name='data'
+    ).data([tuple(body.get(attr.key) for attr in columns) for body in bodies])
+
+
+def coalesce_values(data: Values, *columns: InstrumentedAttribute) -> dict[str, Any]:
+    return {attr.key: func.coalesce(data.c[attr.key], attr) for attr in columns}
@@ -1,14 +1,40 @@
+from decimal import Decimal
+from typing import Any, Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import Result, ScalarResult, delete, exc, select, update
+from sqlalchemy import (
+    Result,
+    Row,
+    ScalarResult,
+    delete,
+    exc,
+    insert,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import override
 
 from src.database.models.dish import Dish
-from src.schemas.dish import DishCreate
+from src.schemas.dish import DishCreate, DishSort
 
 from .base_classes import CrudeBase
+from .bulk import bulk_values, coalesce_values
+
+DISH_COLUMNS = (
+    Dish.id,
+    Dish.title,
+    Dish.description,
+    Dish.price,
+)
+
+DISH_ORDER = {
+    'id': (Dish.id,),
+    'price': (Dish.price, Dish.id),
+    '-price': (Dish.price.desc(), Dish.id.desc()),
+}
 
 
 class DishDAL(CrudeBase):
@@ -18,18 +44,27 @@ class DishDAL(CrudeBase):
     @override
     async def create(
         self, submenu_id: UUID, dish_body: DishCreate
-    ) -> Dish | Exception:
+    ) -> Row[tuple[Dish]] | Exception:
         try:
-            dish = Dish(
-                title=dish_body.title,
-                description=dish_body.description,
-                price=dish_body.price,
-                submenu_id=submenu_id,
+            stmt = (
+                insert(Dish)
+                .values(
+                    title=dish_body.title,
+                    description=dish_body.description,
+                    price=dish_body.price,
+                    submenu_id=submenu_id,
+                )
+                .returning(*DISH_COLUMNS)
             )
-            self.db_session.add(dish)
+            res: Result = await self.db_session.execute(stmt)
+            dish: Row[tuple[Dish]] = res.one()
             await self.db_session.commit()
-            await self.db_session.refresh(dish)
             return dish
+        except exc.IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='submenu not found',
+            )
         except exc.SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,15 +99,25 @@ class DishDAL(CrudeBase):
             )
 
     async def get_list(
-        self, submenu_id: UUID, offset: int, limit: int
+        self, submenu_id: UUID, offset: int, limit: int, after: UUID | None = None,
+        min_price: Decimal | None = None, max_price: Decimal | None = None, sort: DishSort = 'id',
+        after_price: Decimal | None = None,
     ) -> ScalarResult:
         try:
             query = (
                 select(Dish)
                 .where(Dish.submenu_id == submenu_id)
-                .offset(offset)
+                .order_by(*DISH_ORDER[sort])
                 .limit(limit)
             )
+            if min_price is not None:
+                query = query.where(Dish.price >= min_price)
+            if max_price is not None:
+                query = query.where(Dish.price <= max_price)
+            if after is not None:
+                query = query.where(self._after(after, after_price, sort))
+            else:
+                query = query.offset(offset)
             res: Result = await self.db_session.execute(query)
             dish_list = res.scalars()
             return dish_list
@@ -87,21 +132,29 @@ class DishDAL(CrudeBase):
                 detail='Неизвестная ошибка при получении списка Dish',
             )
 
+    @staticmethod
+    def _after(after: UUID, after_price: Decimal | None, sort: DishSort) -> Any:
+        if sort == 'id':
+            return Dish.id > after
+        position = tuple_(Dish.price, Dish.id)
+        if sort == 'price':
+            return position > (after_price, after)
+        return position < (after_price, after)
+
     @override
     async def update(
         self, submenu_id: UUID, dish_id: UUID, dish_body: dict[str, str]
-    ) -> Dish | Exception | None:
+    ) -> Row[tuple[Dish]] | Exception | None:
         try:
             stmt = (
                 update(Dish)
                 .where(Dish.id == dish_id, Dish.submenu_id == submenu_id)
                 .values(**dish_body)
-                .returning(Dish.id)
+                .returning(*DISH_COLUMNS)
             )
             res: Result = await self.db_session.execute(stmt)
+            dish: Row[tuple[Dish]] | None = res.fetchone()
             await self.db_session.commit()
-            dish_id = res.scalar()
-            dish = await self.db_session.get(Dish, dish_id)
             return dish
         except exc.SQLAlchemyError:
             raise HTTPException(
@@ -138,3 +191,73 @@ class DishDAL(CrudeBase):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail='Неизвестная ошибка при удалении Dish',
             )
+
+    async def create_many(
+        self, submenu_id: UUID, bodies: list[DishCreate]
+    ) -> Sequence[Row[tuple[Dish]]]:
+        if not bodies:
+            return []
+        try:
+            stmt = insert(Dish).returning(*DISH_COLUMNS, sort_by_parameter_order=True)
+            res: Result = await self.db_session.execute(
+                stmt, [{**body.model_dump(), 'submenu_id': submenu_id} for body in bodies]
+            )
+            dishes = res.all()
+            await self.db_session.commit()
+            return dishes
+        except exc.IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='submenu not found',
+            )
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при создании списка Dish',
+            )
+
+    async def update_many(
+        self, submenu_id: UUID, bodies: list[dict[str, Any]]
+    ) -> set[UUID]:
+        if not bodies:
+            return set()
+        try:
+            data = bulk_values(bodies, Dish.id, Dish.title, Dish.description, Dish.price)
+            stmt = (
+                update(Dish)
+                .where(Dish.id == data.c.id, Dish.submenu_id == submenu_id)
+                .values(**coalesce_values(data, Dish.title, Dish.description, Dish.price))
+                .returning(Dish.id)
+                .execution_options(synchronize_session=False)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            updated_ids = set(res.scalars().all())
+            await self.db_session.commit()
+            return updated_ids
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при обновлении списка Dish',
+            )
+
+    async def delete_many(
+        self, submenu_id: UUID, dish_ids: list[UUID]
+    ) -> set[UUID]:
+        if not dish_ids:
+            return set()
+        try:
+            stmt = (
+                delete(Dish)
+                .where(Dish.id.in_(dish_ids), Dish.submenu_id == submenu_id)
+                .returning(Dish.id)
+                .execution_options(synchronize_session=False)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            deleted_ids = set(res.scalars().all())
+            await self.db_session.commit()
+            return deleted_ids
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при удалении списка Dish',
+            )
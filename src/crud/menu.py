@@ -1,8 +1,21 @@
-from typing import Any, Sequence
+from typing import Any, AsyncIterator, Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import Result, Row, delete, exc, func, select, update
+from sqlalchemy import (
+    Result,
+    Row,
+    Text,
+    cast,
+    delete,
+    exc,
+    func,
+    insert,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from typing_extensions import override
@@ -13,6 +26,57 @@ from src.database.models.submenu import Submenu
 from src.schemas.menu import MenuCreate
 
 from .base_classes import CrudeBase
+from .bulk import bulk_values, coalesce_values
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def json_list(obj: Any, order_by: Any) -> Any:
+    return func.coalesce(func.json_agg(aggregate_order_by(obj, order_by)), EMPTY_JSON_ARRAY)
+
+
+def menu_json(menu: Any) -> Any:
+    dishes = (
+        select(json_list(
+            func.json_build_object(
+                'id', Dish.id,
+                'title', Dish.title,
+                'description', Dish.description,
+                'price', cast(Dish.price, Text),
+            ),
+            Dish.id,
+        ))
+        .where(Dish.submenu_id == Submenu.id)
+        .scalar_subquery()
+    )
+    submenus = (
+        select(json_list(
+            func.json_build_object(
+                'id', Submenu.id,
+                'title', Submenu.title,
+                'description', Submenu.description,
+                'dishes', dishes,
+            ),
+            Submenu.id,
+        ))
+        .where(Submenu.menu_id == menu.id)
+        .scalar_subquery()
+    )
+    return func.json_build_object(
+        'id', menu.id,
+        'title', menu.title,
+        'description', menu.description,
+        'submenus', submenus,
+    )
+
+
+MENU_COLUMNS = (
+    Menu.id,
+    Menu.title,
+    Menu.description,
+    Menu.submenus_count,
+    Menu.dishes_count,
+)
 
 
 class MenuDAL(CrudeBase):
@@ -20,14 +84,17 @@ class MenuDAL(CrudeBase):
         self.db_session = session
 
     @override
-    async def create(self, body: MenuCreate) -> Menu | Exception | Any:
+    async def create(self, body: MenuCreate) -> Row[tuple[Menu, int, int]] | Exception | Any:
         try:
-            new_menu = Menu(title=body.title,
-                            description=body.description)
-            self.db_session.add(new_menu)
+            stmt = (
+                insert(Menu)
+                .values(title=body.title, description=body.description)
+                .returning(*MENU_COLUMNS)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            new_menu: Row[tuple[Menu, int, int]] = res.one()
             await self.db_session.commit()
-            await self.db_session.refresh(new_menu)
-            return await self.get(new_menu.id)
+            return new_menu
         except exc.SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -45,18 +112,8 @@ class MenuDAL(CrudeBase):
     ) -> Row[tuple[Menu, int, int]] | Exception | None:
         try:
             query = (
-                select(
-                    Menu.id,
-                    Menu.title,
-                    Menu.description,
-                    func.count(Submenu.id.distinct()).label('submenus_count'),
-                    func.count(Dish.id.distinct()).label('dishes_count'),
-                )
+                select(*MENU_COLUMNS)
                 .where(Menu.id == menu_id)
-                .select_from(Menu)
-                .outerjoin(Submenu)
-                .outerjoin(Dish)
-                .group_by(Menu.id, Menu.title, Menu.description)
             )
             res: Result = await self.db_session.execute(query)
             menu_info: Row[tuple[Menu, int, int]] | None = res.fetchone()
@@ -69,24 +126,18 @@ class MenuDAL(CrudeBase):
             )
 
     async def get_list(
-            self, offset: int, limit: int
+            self, offset: int, limit: int, after: UUID | None = None
     ) -> Sequence[Row[tuple[Menu, int, int]]]:
         try:
             query = (
-                select(
-                    Menu.id,
-                    Menu.title,
-                    Menu.description,
-                    func.count(Submenu.id.distinct()).label('submenus_count'),
-                    func.count(Dish.id.distinct()).label('dishes_count'),
-                )
-                .select_from(Menu)
-                .outerjoin(Submenu, Menu.id == Submenu.menu_id)
-                .outerjoin(Dish, Submenu.id == Dish.submenu_id)
-                .group_by(Menu.id, Menu.title, Menu.description)
-                .offset(offset=offset)
+                select(*MENU_COLUMNS)
+                .order_by(Menu.id)
                 .limit(limit=limit)
             )
+            if after is not None:
+                query = query.where(Menu.id > after)
+            else:
+                query = query.offset(offset=offset)
             res: Result = await self.db_session.execute(query)
             menu_list = res.all()
             return menu_list
@@ -105,12 +156,17 @@ class MenuDAL(CrudeBase):
     @override
     async def update(
             self, menu_id: UUID, body: dict[str, str]
-    ) -> Menu | Exception | None:
+    ) -> Row[tuple[Menu, int, int]] | Exception | None:
         try:
-            stmt = update(Menu).where(Menu.id == menu_id).values(**body)
-            await self.db_session.execute(stmt)
+            stmt = (
+                update(Menu)
+                .where(Menu.id == menu_id)
+                .values(**body)
+                .returning(*MENU_COLUMNS)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            menu: Row[tuple[Menu, int, int]] | None = res.fetchone()
             await self.db_session.commit()
-            menu = await self.get(menu_id)
             return menu
 
         except exc.SQLAlchemyError:
@@ -144,6 +200,67 @@ class MenuDAL(CrudeBase):
                 detail='Неизвестная ошибка при удалении Menu',
             )
 
+    async def create_many(
+            self, bodies: list[MenuCreate]
+    ) -> Sequence[Row[tuple[Menu, int, int]]]:
+        if not bodies:
+            return []
+        try:
+            stmt = insert(Menu).returning(*MENU_COLUMNS, sort_by_parameter_order=True)
+            res: Result = await self.db_session.execute(
+                stmt, [body.model_dump() for body in bodies]
+            )
+            menus = res.all()
+            await self.db_session.commit()
+            return menus
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при создании списка Menu',
+            )
+
+    async def update_many(self, bodies: list[dict[str, Any]]) -> set[UUID]:
+        if not bodies:
+            return set()
+        try:
+            data = bulk_values(bodies, Menu.id, Menu.title, Menu.description)
+            stmt = (
+                update(Menu)
+                .where(Menu.id == data.c.id)
+                .values(**coalesce_values(data, Menu.title, Menu.description))
+                .returning(Menu.id)
+                .execution_options(synchronize_session=False)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            updated_ids = set(res.scalars().all())
+            await self.db_session.commit()
+            return updated_ids
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при обновлении списка Menu',
+            )
+
+    async def delete_many(self, menu_ids: list[UUID]) -> set[UUID]:
+        if not menu_ids:
+            return set()
+        try:
+            stmt = (
+                delete(Menu)
+                .where(Menu.id.in_(menu_ids))
+                .returning(Menu.id)
+                .execution_options(synchronize_session=False)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            deleted_ids = set(res.scalars().all())
+            await self.db_session.commit()
+            return deleted_ids
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при удалении списка Menu',
+            )
+
     async def get_full_menus_submenus_dishes(
             self, offset: int, limit: int
     ) -> Sequence[Row[tuple[Menu, int, int]]]:
@@ -152,6 +269,7 @@ class MenuDAL(CrudeBase):
                 select(Menu
                        )
                 .options(selectinload(Menu.submenus).selectinload(Submenu.dishes))
+                .order_by(Menu.id)
                 .offset(offset=offset)
                 .limit(limit=limit)
             )
@@ -164,3 +282,51 @@ class MenuDAL(CrudeBase):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail='Ошибка SqlalchemyError при получении списка Menu, Submenu, Dish',
             )
+
+    async def get_full_menus_submenus_dishes_json(self, offset: int, limit: int) -> str:
+        try:
+            menus = (
+                select(Menu.id, Menu.title, Menu.description)
+                .order_by(Menu.id)
+                .offset(offset=offset)
+                .limit(limit=limit)
+                .subquery('menus')
+            )
+            query = select(
+                cast(
+                    func.coalesce(
+                        func.json_agg(aggregate_order_by(menu_json(menus.c), menus.c.id)),
+                        EMPTY_JSON_ARRAY,
+                    ),
+                    Text,
+                )
+            )
+            res: Result = await self.db_session.execute(query)
+            return res.scalar_one()
+
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при получении списка Menu, Submenu, Dish',
+            )
+
+    async def stream_full_menus_submenus_dishes(
+            self, offset: int, limit: int | None, batch_size: int
+    ) -> AsyncIterator[str]:
+        try:
+            query = (
+                select(cast(menu_json(Menu), Text))
+                .order_by(Menu.id)
+                .offset(offset=offset)
+                .limit(limit=limit)
+                .execution_options(yield_per=batch_size)
+            )
+            menus = await self.db_session.stream_scalars(query)
+            async for menu in menus:
+                yield menu
+
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при получении списка Menu, Submenu, Dish',
+            )
@@ -0,0 +1,94 @@
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from asyncpg import Connection, PostgresError
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.schemas.dish import DishSort
+
+MENU_FIELDS = 'id, title, description, submenus_count, dishes_count'
+DISH_FIELDS = 'id, title, description, price'
+
+MENU_BY_ID = f'SELECT {MENU_FIELDS} FROM menu WHERE id = $1'
+MENU_PAGE = f'SELECT {MENU_FIELDS} FROM menu ORDER BY id OFFSET $1 LIMIT $2'
+MENU_PAGE_AFTER = f'SELECT {MENU_FIELDS} FROM menu WHERE id > $1 ORDER BY id LIMIT $2'
+
+DISH_FILTER = (
+    f'SELECT {DISH_FIELDS} FROM dish WHERE submenu_id = $1'
+    ' AND ($2::numeric IS NULL OR price >= $2) AND ($3::numeric IS NULL OR price <= $3)'
+)
+DISH_PAGE = {
+    'id': f'{DISH_FILTER} ORDER BY id OFFSET $4 LIMIT $5',
+    'price': f'{DISH_FILTER} ORDER BY price, id OFFSET $4 LIMIT $5',
+    '-price': f'{DISH_FILTER} ORDER BY price DESC, id DESC OFFSET $4 LIMIT $5',
+}
+DISH_PAGE_AFTER = {
+    'id': f'{DISH_FILTER} AND id > $4 ORDER BY id LIMIT $5',
+    'price': f'{DISH_FILTER} AND (price, id) > ($4, $5) ORDER BY price, id LIMIT $6',
+    '-price': f'{DISH_FILTER} AND (price, id) < ($4, $5) ORDER BY price DESC, id DESC LIMIT $6',
+}
+
+
+class RawDAL:
+    # Runs on the asyncpg connection the session checked out, so replica routing
+    # and transactions are shared with the ORM DALs; asyncpg caches the prepared statements.
+    def __init__(self, session: AsyncSession) -> None:
+        self.db_session = session
+
+    async def _connection(self) -> Connection:
+        connection = await self.db_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    async def _fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        connection = await self._connection()
+        return [dict(record) for record in await connection.fetch(query, *args)]
+
+    async def _fetchrow(self, query: str, *args: Any) -> dict[str, Any] | None:
+        connection = await self._connection()
+        record = await connection.fetchrow(query, *args)
+        return dict(record) if record is not None else None
+
+
+class MenuRawDAL(RawDAL):
+    async def get(self, menu_id: UUID) -> dict[str, Any] | None:
+        try:
+            return await self._fetchrow(MENU_BY_ID, menu_id)
+        except PostgresError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка PostgresError при получение Menu',
+            )
+
+    async def get_list(
+            self, offset: int, limit: int, after: UUID | None = None
+    ) -> list[dict[str, Any]]:
+        try:
+            if after is not None:
+                return await self._fetch(MENU_PAGE_AFTER, after, limit)
+            return await self._fetch(MENU_PAGE, offset, limit)
+        except PostgresError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка PostgresError при получении списка Menu',
+            )
+
+
+class DishRawDAL(RawDAL):
+    async def get_list(
+            self, submenu_id: UUID, offset: int, limit: int, after: UUID | None = None,
+            min_price: Decimal | None = None, max_price: Decimal | None = None, sort: DishSort = 'id',
+            after_price: Decimal | None = None,
+    ) -> list[dict[str, Any]]:
+        try:
+            if after is not None:
+                position = (after,) if sort == 'id' else (after_price, after)
+                return await self._fetch(DISH_PAGE_AFTER[sort], submenu_id, min_price, max_price, *position, limit)
+            return await self._fetch(DISH_PAGE[sort], submenu_id, min_price, max_price, offset, limit)
+        except PostgresError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка PostgresError при получении списка Dish',
+            )
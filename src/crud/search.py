@@ -0,0 +1,76 @@
+from typing import Any, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    UUID,
+    Result,
+    Row,
+    cast,
+    exc,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.dish import Dish
+from src.database.models.menu import Menu
+from src.database.models.submenu import Submenu
+from src.database.search import SEARCH_CONFIG
+
+NO_PARENT = cast(null(), UUID(as_uuid=True))
+SEARCH_REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+def search_hits(model: Any, kind: str, phrase: str, menu_id: Any, submenu_id: Any) -> Any:
+    query = func.websearch_to_tsquery(SEARCH_REGCONFIG, phrase)
+    return (
+        select(
+            literal_column(f"'{kind}'").label('type'),
+            model.id,
+            model.title,
+            model.description,
+            menu_id.label('menu_id'),
+            submenu_id.label('submenu_id'),
+            (
+                func.ts_rank(model.search_vector, query) + func.word_similarity(phrase, model.title)
+            ).label('rank'),
+        )
+        .where(or_(
+            model.search_vector.op('@@')(query),
+            literal(phrase).op('<%')(model.title),
+            literal(phrase).op('<%')(model.description),
+        ))
+    )
+
+
+class SearchDAL:
+    def __init__(self, session: AsyncSession) -> None:
+        self.db_session = session
+
+    async def search(self, phrase: str, offset: int, limit: int) -> Sequence[Row]:
+        try:
+            hits = union_all(
+                search_hits(Menu, 'menu', phrase, NO_PARENT, NO_PARENT),
+                search_hits(Submenu, 'submenu', phrase, Submenu.menu_id, NO_PARENT),
+                search_hits(Dish, 'dish', phrase, Submenu.menu_id, Dish.submenu_id)
+                .join(Submenu, Submenu.id == Dish.submenu_id),
+            ).subquery('hits')
+            query = (
+                select(hits)
+                .order_by(hits.c.rank.desc(), hits.c.id)
+                .offset(offset=offset)
+                .limit(limit=limit)
+            )
+            res: Result = await self.db_session.execute(query)
+            return res.all()
+
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при поиске',
+            )
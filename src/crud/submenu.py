@@ -1,16 +1,23 @@
-from typing import Sequence
+from typing import Any, Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import Result, Row, delete, exc, func, select, update
+from sqlalchemy import Result, Row, delete, exc, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import override
 
-from src.database.models.dish import Dish
 from src.database.models.submenu import Submenu
 from src.schemas.submenu import SubmenuCreate
 
 from .base_classes import CrudeBase
+from .bulk import bulk_values, coalesce_values
+
+SUBMENU_COLUMNS = (
+    Submenu.id,
+    Submenu.title,
+    Submenu.description,
+    Submenu.dishes_count,
+)
 
 
 class SubmenuDAL(CrudeBase):
@@ -20,17 +27,26 @@ class SubmenuDAL(CrudeBase):
     @override
     async def create(
         self, menu_id: UUID, submenu_body: SubmenuCreate
-    ) -> Submenu | Exception | None:
+    ) -> Row[tuple[Submenu, int]] | Exception | None:
         try:
-            submenu: Submenu = Submenu(
-                title=submenu_body.title,
-                description=submenu_body.description,
-                menu_id=menu_id,
+            stmt = (
+                insert(Submenu)
+                .values(
+                    title=submenu_body.title,
+                    description=submenu_body.description,
+                    menu_id=menu_id,
+                )
+                .returning(*SUBMENU_COLUMNS)
             )
-            self.db_session.add(submenu)
+            res: Result = await self.db_session.execute(stmt)
+            submenu: Row[tuple[Submenu, int]] = res.one()
             await self.db_session.commit()
-            await self.db_session.refresh(submenu)
-            return await self.get(menu_id, submenu.id)
+            return submenu
+        except exc.IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='menu not found',
+            )
         except exc.SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -48,16 +64,8 @@ class SubmenuDAL(CrudeBase):
     ) -> Row[tuple[Submenu, int]] | Exception | None:
         try:
             query = (
-                select(
-                    Submenu.id,
-                    Submenu.title,
-                    Submenu.description,
-                    func.count(Dish.id.distinct()).label('dishes_count'),
-                )
+                select(*SUBMENU_COLUMNS)
                 .where(Submenu.menu_id == menu_id, Submenu.id == submenu_id)
-                .select_from(Submenu)
-                .outerjoin(Dish)
-                .group_by(Submenu.id, Submenu.title, Submenu.description)
             )
             res: Result = await self.db_session.execute(query)
             submenu: Row[tuple[Submenu, int]] | None = res.fetchone()
@@ -75,23 +83,19 @@ class SubmenuDAL(CrudeBase):
             )
 
     async def get_list(
-        self, menu_id: UUID, offset: int, limit: int
+        self, menu_id: UUID, offset: int, limit: int, after: UUID | None = None
     ) -> Sequence[Row[tuple[Submenu, int]]]:
         try:
             query = (
-                select(
-                    Submenu.id,
-                    Submenu.title,
-                    Submenu.description,
-                    func.count(Dish.id.distinct()).label('dishes_count'),
-                )
+                select(*SUBMENU_COLUMNS)
                 .where(Submenu.menu_id == menu_id)
-                .select_from(Submenu)
-                .outerjoin(Dish)
-                .group_by(Submenu.id, Submenu.title, Submenu.description)
-                .offset(offset)
+                .order_by(Submenu.id)
                 .limit(limit)
             )
+            if after is not None:
+                query = query.where(Submenu.id > after)
+            else:
+                query = query.offset(offset)
             res: Result = await self.db_session.execute(query)
             dish_list: Sequence[Row[tuple[Submenu, int]]] = res.all()
             return dish_list
@@ -109,16 +113,18 @@ class SubmenuDAL(CrudeBase):
     @override
     async def update(
         self, menu_id: UUID, submenu_id: UUID, submenu_body: dict[str, str]
-    ) -> Submenu | None | Exception:
+    ) -> Row[tuple[Submenu, int]] | None | Exception:
         try:
             stmt = (
                 update(Submenu)
                 .where(Submenu.id == submenu_id, Submenu.menu_id == menu_id)
                 .values(**submenu_body)
+                .returning(*SUBMENU_COLUMNS)
             )
-            await self.db_session.execute(stmt)
+            res: Result = await self.db_session.execute(stmt)
+            submenu: Row[tuple[Submenu, int]] | None = res.fetchone()
             await self.db_session.commit()
-            return await self.get(menu_id, submenu_id)
+            return submenu
         except exc.SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -155,3 +161,73 @@ class SubmenuDAL(CrudeBase):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail='Неизвестная ошибка при удалении Submenu',
             )
+
+    async def create_many(
+        self, menu_id: UUID, bodies: list[SubmenuCreate]
+    ) -> Sequence[Row[tuple[Submenu, int]]]:
+        if not bodies:
+            return []
+        try:
+            stmt = insert(Submenu).returning(*SUBMENU_COLUMNS, sort_by_parameter_order=True)
+            res: Result = await self.db_session.execute(
+                stmt, [{**body.model_dump(), 'menu_id': menu_id} for body in bodies]
+            )
+            submenus = res.all()
+            await self.db_session.commit()
+            return submenus
+        except exc.IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='menu not found',
+            )
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при создании списка Submenu',
+            )
+
+    async def update_many(
+        self, menu_id: UUID, bodies: list[dict[str, Any]]
+    ) -> set[UUID]:
+        if not bodies:
+            return set()
+        try:
+            data = bulk_values(bodies, Submenu.id, Submenu.title, Submenu.description)
+            stmt = (
+                update(Submenu)
+                .where(Submenu.id == data.c.id, Submenu.menu_id == menu_id)
+                .values(**coalesce_values(data, Submenu.title, Submenu.description))
+                .returning(Submenu.id)
+                .execution_options(synchronize_session=False)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            updated_ids = set(res.scalars().all())
+            await self.db_session.commit()
+            return updated_ids
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при обновлении списка Submenu',
+            )
+
+    async def delete_many(
+        self, menu_id: UUID, submenu_ids: list[UUID]
+    ) -> set[UUID]:
+        if not submenu_ids:
+            return set()
+        try:
+            stmt = (
+                delete(Submenu)
+                .where(Submenu.id.in_(submenu_ids), Submenu.menu_id == menu_id)
+                .returning(Submenu.id)
+                .execution_options(synchronize_session=False)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            deleted_ids = set(res.scalars().all())
+            await self.db_session.commit()
+            return deleted_ids
+        except exc.SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Ошибка SqlalchemyError при удалении списка Submenu',
+            )
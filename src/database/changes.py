@@ -0,0 +1,60 @@
+CHANGES_CHANNEL = 'menu_changes'
+
+NOTIFY_TABLES = ('menu', 'submenu', 'dish')
+
+NOTIFY_CHANGE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notify_change(entity text, data jsonb) RETURNS void AS $$
+BEGIN
+    IF entity = 'dish' THEN
+        data := data || jsonb_build_object(
+            'menu_id', (SELECT menu_id FROM submenu WHERE id = (data ->> 'submenu_id')::uuid)
+        );
+    END IF;
+    PERFORM pg_notify('{CHANGES_CHANNEL}', jsonb_build_object(
+        'table', entity,
+        'id', data -> 'id',
+        'menu_id', data -> 'menu_id',
+        'submenu_id', data -> 'submenu_id'
+    )::text);
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NOTIFY_CHANGES_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notify_changes() RETURNS trigger AS $$
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        PERFORM pg_notify('{CHANGES_CHANNEL}', json_build_object('table', TG_TABLE_NAME, 'truncate', true)::text);
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM notify_change(TG_TABLE_NAME, to_jsonb(OLD));
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM notify_change(TG_TABLE_NAME, to_jsonb(NEW));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NOTIFY_TRIGGERS = [
+    statement
+    for table in NOTIFY_TABLES
+    for statement in (
+        f"""
+        CREATE TRIGGER {table}_notify AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION notify_changes()
+        """,
+        f"""
+        CREATE TRIGGER {table}_notify_truncate AFTER TRUNCATE ON {table}
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_changes()
+        """,
+    )
+]
+
+NOTIFY_DDL = [
+    NOTIFY_CHANGE_FUNCTION,
+    NOTIFY_CHANGES_FUNCTION,
+    *NOTIFY_TRIGGERS,
+]
@@ -0,0 +1,66 @@
+import json
+from abc import ABCMeta, abstractmethod
+from typing import Any
+from uuid import UUID
+
+import msgpack
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+
+class Codec(metaclass=ABCMeta):
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        pass
+
+
+class JsonCodec(Codec):
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(jsonable_encoder(value)).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=_default)
+
+    def decode(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=_default)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not serializable')
+
+
+CODECS: dict[str, type[Codec]] = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec,
+    'msgpack': MsgpackCodec,
+}
+
+
+def get_codec(name: str) -> Codec:
+    return CODECS[name]()
+
+
+def dump_json(value: Any) -> str:
+    return orjson.dumps(value, default=_default).decode()
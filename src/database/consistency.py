@@ -0,0 +1,28 @@
+import time
+from contextvars import ContextVar
+
+CONSISTENCY_HEADER = 'X-Consistency-Token'
+
+_scope_written_at: ContextVar[float] = ContextVar('scope_written_at', default=0.0)
+
+
+def issue_token() -> str:
+    return f'{time.time():.6f}'
+
+
+def token_time(token: str | None) -> float:
+    if token is None:
+        return 0.0
+    try:
+        return float(token)
+    except ValueError:
+        return 0.0
+
+
+def note_write(written_at: float) -> None:
+    if written_at > _scope_written_at.get():
+        _scope_written_at.set(written_at)
+
+
+def scope_written_at() -> float:
+    return _scope_written_at.get()
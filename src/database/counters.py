@@ -0,0 +1,92 @@
+SUBMENU_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION submenu_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE menu
+        SET submenus_count = submenus_count + 1,
+            dishes_count = dishes_count + NEW.dishes_count
+        WHERE id = NEW.menu_id;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE menu
+        SET submenus_count = submenus_count - 1,
+            dishes_count = dishes_count - OLD.dishes_count
+        WHERE id = OLD.menu_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+DISH_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION dish_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE submenu SET dishes_count = dishes_count + 1 WHERE id = NEW.submenu_id;
+        UPDATE menu SET dishes_count = dishes_count + 1
+        WHERE id = (SELECT menu_id FROM submenu WHERE id = NEW.submenu_id);
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE submenu SET dishes_count = dishes_count - 1 WHERE id = OLD.submenu_id;
+        UPDATE menu SET dishes_count = dishes_count - 1
+        WHERE id = (SELECT menu_id FROM submenu WHERE id = OLD.submenu_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+SUBMENU_COUNTS_TRIGGERS = [
+    """
+    CREATE TRIGGER submenu_counts AFTER INSERT OR DELETE ON submenu
+    FOR EACH ROW EXECUTE FUNCTION submenu_counts()
+    """,
+    """
+    CREATE TRIGGER submenu_counts_move AFTER UPDATE OF menu_id ON submenu
+    FOR EACH ROW WHEN (OLD.menu_id IS DISTINCT FROM NEW.menu_id)
+    EXECUTE FUNCTION submenu_counts()
+    """,
+]
+
+DISH_COUNTS_TRIGGERS = [
+    """
+    CREATE TRIGGER dish_counts AFTER INSERT OR DELETE ON dish
+    FOR EACH ROW EXECUTE FUNCTION dish_counts()
+    """,
+    """
+    CREATE TRIGGER dish_counts_move AFTER UPDATE OF submenu_id ON dish
+    FOR EACH ROW WHEN (OLD.submenu_id IS DISTINCT FROM NEW.submenu_id)
+    EXECUTE FUNCTION dish_counts()
+    """,
+]
+
+COUNTS_DDL = [
+    SUBMENU_COUNTS_FUNCTION,
+    DISH_COUNTS_FUNCTION,
+    *SUBMENU_COUNTS_TRIGGERS,
+    *DISH_COUNTS_TRIGGERS,
+]
+
+RECONCILE_COUNTS = [
+    'LOCK TABLE submenu, dish IN SHARE MODE',
+    """
+    UPDATE submenu SET dishes_count = counts.dishes
+    FROM (
+        SELECT submenu.id, count(dish.id) AS dishes
+        FROM submenu LEFT JOIN dish ON dish.submenu_id = submenu.id
+        GROUP BY submenu.id
+    ) AS counts
+    WHERE submenu.id = counts.id AND submenu.dishes_count <> counts.dishes
+    """,
+    """
+    UPDATE menu SET submenus_count = counts.submenus, dishes_count = counts.dishes
+    FROM (
+        SELECT menu.id, count(submenu.id) AS submenus,
+               coalesce(sum(submenu.dishes_count), 0) AS dishes
+        FROM menu LEFT JOIN submenu ON submenu.menu_id = menu.id
+        GROUP BY menu.id
+    ) AS counts
+    WHERE menu.id = counts.id
+      AND (menu.submenus_count, menu.dishes_count) IS DISTINCT FROM (counts.submenus, counts.dishes)
+    """,
+]
@@ -0,0 +1,19 @@
+import secrets
+import threading
+import time
+from uuid import UUID
+
+_lock = threading.Lock()
+_last_sequence = 0
+
+
+def uuid7() -> UUID:
+    # RFC 9562 UUIDv7: 48-bit unix milliseconds, then a 12-bit counter in rand_a so ids
+    # generated within the same millisecond stay strictly increasing.
+    global _last_sequence
+    with _lock:
+        _last_sequence = max((time.time_ns() // 1_000_000) << 12, _last_sequence + 1)
+        sequence = _last_sequence
+    millis, counter = divmod(sequence, 1 << 12)
+    value = millis << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | secrets.randbits(62)
+    return UUID(int=value)
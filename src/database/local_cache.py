@@ -0,0 +1,44 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class LocalCache:
+    def __init__(self, max_size: int, ttl: float, max_bytes: int | None = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.items: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        item = self.items.get(key)
+        if item is None:
+            return None
+        expires_at, value, _ = item
+        if expires_at < time.monotonic():
+            self.delete(key)
+            return None
+        self.items.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, size: int = 0) -> None:
+        # size is the encoded length in Redis; entries bigger than the whole budget stay in Redis only.
+        self.delete(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self.items[key] = (time.monotonic() + self.ttl, value, size)
+        self.bytes += size
+        while len(self.items) > self.max_size or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            _, (_, _, evicted) = self.items.popitem(last=False)
+            self.bytes -= evicted
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            item = self.items.pop(key, None)
+            if item is not None:
+                self.bytes -= item[2]
+
+    def clear(self) -> None:
+        self.items.clear()
+        self.bytes = 0
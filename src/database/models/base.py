@@ -1,12 +1,13 @@
-import uuid
-
 from sqlalchemy.orm import (
     DeclarativeBase,
     declared_attr,
     Mapped,
     mapped_column,
 )
-from sqlalchemy import UUID
+from sqlalchemy import DDL, UUID, event
+
+from src.database.ids import uuid7
+from src.database.search import TRGM_EXTENSION
 
 
 class Base(DeclarativeBase):
@@ -17,5 +18,8 @@ class Base(DeclarativeBase):
         return f"{cls.__name__.lower()}"
 
     id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
+
+
+event.listen(Base.metadata, "before_create", DDL(TRGM_EXTENSION))
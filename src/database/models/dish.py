@@ -1,19 +1,32 @@
 import uuid
+from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy import ForeignKey, UUID
+from sqlalchemy import DDL, ForeignKey, Index, Numeric, UUID, event
 
+from src.database.changes import NOTIFY_DDL
+from src.database.counters import COUNTS_DDL
 from src.database.models.base import Base
+from src.database.search import search_indexes, search_vector_column
 
 if TYPE_CHECKING:
     from .submenu import Submenu
 
 
 class Dish(Base):
+    __table_args__ = (
+        Index("ix_dish_submenu_id_id", "submenu_id", "id"),
+        Index("ix_dish_submenu_id_price_id", "submenu_id", "price", "id"),
+        Index("ix_dish_excel_key", "excel_key", unique=True),
+        *search_indexes("dish"),
+    )
+
     title: Mapped[str]
     description: Mapped[str]
-    price: Mapped[str]
+    price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    search_vector: Mapped[str] = search_vector_column()
+    excel_key: Mapped[str | None]
 
     submenu_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -26,3 +39,7 @@ class Dish(Base):
 
     def __repr__(self) -> str:
         return f"Dish: ({self.id} - {self.title})"
+
+
+for statement in (*COUNTS_DDL, *NOTIFY_DDL):
+    event.listen(Dish.__table__, "after_create", DDL(statement))
@@ -1,12 +1,23 @@
-from sqlalchemy.orm import relationship, Mapped
+from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy import Index
 
 from src.database.models.base import Base
 from src.database.models.submenu import Submenu
+from src.database.search import search_indexes, search_vector_column
 
 
 class Menu(Base):
+    __table_args__ = (
+        Index("ix_menu_excel_key", "excel_key", unique=True),
+        *search_indexes("menu"),
+    )
+
     title: Mapped[str]
     description: Mapped[str]
+    submenus_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    dishes_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    search_vector: Mapped[str] = search_vector_column()
+    excel_key: Mapped[str | None]
 
     submenus: Mapped[list["Submenu"]] = relationship(
         back_populates="menu", cascade="all, delete", passive_deletes=True
@@ -14,19 +25,3 @@ class Menu(Base):
 
     def __repr__(self) -> str:
         return f"Menu: ({self.id} - {self.title})"
-
-
-# Menu.submenus_count = column_property(
-#     select(func.count(Submenu.id))
-#     .where(Menu.id == Submenu.menu_id)
-#     .correlate_except(Submenu)
-#     .scalar_subquery()
-# )
-#
-# Menu.dishes_count = column_property(
-#     select(func.count(Dish.id))
-#     .join(Submenu, Submenu.menu_id == Menu.id)
-#     .where(Dish.submenu_id == Submenu.id)
-#     .correlate_except(Submenu)
-#     .scalar_subquery(),
-# )
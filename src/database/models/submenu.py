@@ -2,18 +2,28 @@ import uuid
 from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy import ForeignKey, UUID
+from sqlalchemy import ForeignKey, Index, UUID
 
 from src.database.models.base import Base
 from src.database.models.dish import Dish
+from src.database.search import search_indexes, search_vector_column
 
 if TYPE_CHECKING:
     from .menu import Menu
 
 
 class Submenu(Base):
+    __table_args__ = (
+        Index("ix_submenu_menu_id_id", "menu_id", "id"),
+        Index("ix_submenu_excel_key", "excel_key", unique=True),
+        *search_indexes("submenu"),
+    )
+
     title: Mapped[str]
     description: Mapped[str]
+    dishes_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    search_vector: Mapped[str] = search_vector_column()
+    excel_key: Mapped[str | None]
 
     menu_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("menu.id", ondelete="CASCADE")
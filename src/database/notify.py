@@ -0,0 +1,101 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable
+from uuid import UUID
+
+import asyncpg
+from aioredis.exceptions import ConnectionError, LockError, TimeoutError
+from aioredis.lock import Lock
+
+from src.database.changes import CHANGES_CHANNEL
+from src.database.redis_cache import (
+    GLOBAL_SCOPE,
+    RedisDB,
+    menu_scope,
+    submenu_scope,
+    with_prefix,
+)
+
+LISTENER_LOCK_KEY = 'lock_changes_listener'
+LISTENER_LOCK_TIMEOUT = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+def change_scopes(change: dict[str, Any]) -> set[str]:
+    scopes = {GLOBAL_SCOPE}
+    if change['table'] == 'menu':
+        scopes.add(menu_scope(UUID(change['id'])))
+    if change['table'] == 'submenu':
+        scopes.add(submenu_scope(UUID(change['id'])))
+    if change.get('menu_id'):
+        scopes.add(menu_scope(UUID(change['menu_id'])))
+    if change.get('submenu_id'):
+        scopes.add(submenu_scope(UUID(change['submenu_id'])))
+    return scopes
+
+
+async def apply_changes(redis: RedisDB, payloads: list[str]) -> None:
+    changes = [json.loads(payload) for payload in payloads]
+    if any(change.get('truncate') for change in changes):
+        await redis.invalidate_namespace()
+        return
+    await redis.bump(*set().union(*[change_scopes(change) for change in changes]))
+
+
+async def listen_changes(redis: RedisDB, dsn: str) -> None:
+    # Every worker runs this, but only the one holding the Redis lock listens, so each
+    # change is bumped once per deployment; the others take over if the holder goes away.
+    interrupted = False
+    while True:
+        lock = redis.redis.lock(with_prefix(LISTENER_LOCK_KEY, redis.prefix), timeout=LISTENER_LOCK_TIMEOUT)
+        try:
+            if await lock.acquire(blocking=False):
+                await _lead(lock, _listen_changes(redis, dsn, interrupted))
+            else:
+                await asyncio.sleep(LISTENER_LOCK_TIMEOUT / 2)
+        except asyncio.CancelledError:
+            raise
+        except (OSError, ConnectionError, TimeoutError, LockError, asyncpg.PostgresError, asyncpg.InterfaceError):
+            await asyncio.sleep(1)
+        except Exception:
+            logger.exception('Change listener failed, restarting')
+            await asyncio.sleep(1)
+        interrupted = True
+
+
+async def _lead(lock: Lock, work: Awaitable[None]) -> None:
+    task = asyncio.ensure_future(work)
+    try:
+        while not task.done():
+            await asyncio.wait([task], timeout=LISTENER_LOCK_TIMEOUT / 3)
+            if not task.done():
+                await lock.reacquire()
+        task.result()
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        try:
+            await lock.release()
+        except LockError:
+            pass
+
+
+async def _listen_changes(redis: RedisDB, dsn: str, interrupted: bool) -> None:
+    connection = await asyncpg.connect(dsn)
+    payloads: asyncio.Queue[str] = asyncio.Queue()
+    try:
+        await connection.add_listener(CHANGES_CHANNEL, lambda *args: payloads.put_nowait(args[-1]))
+        if interrupted:
+            await redis.invalidate_namespace()
+        while not connection.is_closed():
+            try:
+                batch = [await asyncio.wait_for(payloads.get(), timeout=1.0)]
+            except asyncio.TimeoutError:
+                continue
+            while not payloads.empty():
+                batch.append(payloads.get_nowait())
+            await apply_changes(redis, batch)
+    finally:
+        await connection.close()
@@ -1,14 +1,194 @@
+import asyncio
+import hashlib
 import json
+import logging
+import math
+import struct
+import time
 from abc import ABCMeta, abstractmethod
-from typing import Any
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Awaitable, Callable
 from uuid import UUID
 
 import backoff
 from aioredis.client import Redis
-from aioredis.exceptions import BusyLoadingError, ConnectionError, TimeoutError
-from fastapi.encoders import jsonable_encoder
+from aioredis.connection import ConnectionPool
+from aioredis.exceptions import (
+    BusyLoadingError,
+    ConnectionError,
+    LockError,
+    TimeoutError,
+)
+from aioredis.lock import Lock
 
 from src.core.config import settings
+from src.database.codecs import Codec, JsonCodec, dump_json, get_codec
+from src.database.consistency import note_write
+from src.database.local_cache import LocalCache
+from src.database.single_flight import SingleFlight
+
+MENU_LIST = 'menu_list'
+FULL_MENUS_SUBMENUS_DISHES = 'full_menus_submenus_dishes'
+GLOBAL_SCOPE = 'menus'
+NAMESPACE_SCOPE = 'namespace'
+INVALIDATION_CHANNEL = 'cache_invalidation'
+EPOCH_KEY = 'epoch'
+LOCK_POLL_INTERVAL = 0.05
+RAW_HEADER = struct.Struct('!ddH')
+
+logger = logging.getLogger(__name__)
+
+
+def menu_scope(menu_id: UUID) -> str:
+    return f'menu_{menu_id}'
+
+
+def submenu_scope(submenu_id: UUID) -> str:
+    return f'submenu_{submenu_id}'
+
+
+def generation_key(scope: str) -> str:
+    return f'gen_{scope}'
+
+
+def written_key(scope: str) -> str:
+    return f'written_{scope}'
+
+
+def decode_number(data: bytes) -> int | float:
+    return float(data) if b'.' in data else int(data)
+
+
+def menu_key(menu_id: UUID) -> str:
+    return f'menu_{menu_id}'
+
+
+def submenu_key(submenu_id: UUID) -> str:
+    return f'submenu_{submenu_id}'
+
+
+def dish_key(dish_id: UUID) -> str:
+    return f'dish_{dish_id}'
+
+
+def submenu_list_key(menu_id: UUID) -> str:
+    return f'submenu_list_{menu_id}'
+
+
+def dish_list_key(
+        submenu_id: UUID, sort: str = 'id', min_price: Decimal | None = None, max_price: Decimal | None = None
+) -> str:
+    if sort == 'id' and min_price is None and max_price is None:
+        return f'dish_list_{submenu_id}'
+    return f'dish_list_{submenu_id}_{sort}_{min_price}_{max_price}'
+
+
+def search_key(phrase: str) -> str:
+    return f'search_{hashlib.sha1(phrase.encode()).hexdigest()}'
+
+
+def page_key(
+        list_name: str, offset: int, limit: int, after: UUID | None = None, after_price: Decimal | None = None
+) -> str:
+    if after is not None and after_price is not None:
+        return f'{list_name}_after_{after_price}_{after}:{limit}'
+    if after is not None:
+        return f'{list_name}_after_{after}:{limit}'
+    return f'{list_name}_{offset}:{limit}'
+
+
+@dataclass
+class CacheResult:
+    value: Any
+    etag: str
+    last_modified: float | None = None
+    not_modified: bool = False
+    next_cursor: str | None = None
+
+
+def make_etag(key: str) -> str:
+    return f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+
+def etag_tags(if_none_match: str) -> list[str]:
+    return [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    return etag in etag_tags(if_none_match)
+
+
+def etag_any(if_none_match: str) -> bool:
+    return '*' in etag_tags(if_none_match)
+
+
+def as_entry(
+        loader: Callable[[], Awaitable[Any]],
+        soft_ttl: float | None,
+        raw: bool = False,
+        cursor: Callable[[Any], str | None] | None = None,
+) -> Callable[[], Awaitable[Any]]:
+    async def load() -> dict[str, Any]:
+        value = await loader()
+        loaded_at = time.time()
+        refresh_at = loaded_at + soft_ttl if soft_ttl is not None else None
+        # The cursor is taken from the loaded rows before a raw entry encodes them.
+        next_cursor = cursor(value) if cursor is not None else None
+        if raw:
+            value = (value if isinstance(value, str) else dump_json(value)).encode()
+        return {
+            'value': value,
+            'next_cursor': next_cursor,
+            'loaded_at': loaded_at,
+            'refresh_at': refresh_at,
+        }
+    return load
+
+
+def entry_related(
+        related: Callable[[Any], dict[str, Any]] | None
+) -> Callable[[Any], dict[str, Any]] | None:
+    if related is None:
+        return None
+    return lambda entry: {
+        key: {'value': value, 'loaded_at': entry['loaded_at'], 'refresh_at': None}
+        for key, value in related(entry['value']).items()
+    }
+
+
+class RawEntryCodec(Codec):
+    # Raw entries keep the response body as-is behind a fixed header with the entry
+    # metadata, so a hit is sliced out instead of decoded.
+    def encode(self, value: dict[str, Any]) -> bytes:
+        cursor = (value['next_cursor'] or '').encode()
+        refresh_at = value['refresh_at'] if value['refresh_at'] is not None else math.nan
+        return RAW_HEADER.pack(value['loaded_at'], refresh_at, len(cursor)) + cursor + value['value']
+
+    def decode(self, data: bytes) -> dict[str, Any]:
+        loaded_at, refresh_at, cursor_size = RAW_HEADER.unpack_from(data)
+        body_start = RAW_HEADER.size + cursor_size
+        return {
+            'value': data[body_start:],
+            'next_cursor': data[RAW_HEADER.size:body_start].decode() or None,
+            'loaded_at': loaded_at,
+            'refresh_at': None if math.isnan(refresh_at) else refresh_at,
+        }
+
+
+RAW_ENTRY_CODEC = RawEntryCodec()
+
+
+def lock_key(key: str) -> str:
+    return f'lock_{key}'
+
+
+def with_version(key: str, version: str) -> str:
+    return f'{key}:{version}'
+
+
+def with_prefix(key: str, prefix: str) -> str:
+    return f'{prefix}:{key}' if prefix else key
 
 
 class RedisDBBase(metaclass=ABCMeta):
@@ -33,61 +213,365 @@ class RedisDBBase(metaclass=ABCMeta):
     async def delete_cache(self, *args: Any) -> Any:
         pass
 
+    @abstractmethod
+    async def get_many(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def set_many(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def delete_many(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def versioned_key(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def bump(self, *args: Any) -> Any:
+        pass
+
 
 class RedisDB(RedisDBBase):
-    def __init__(self, host: str, port: int, password: str, expire_in_sec: int) -> None:
+    def __init__(self, host: str, port: int, password: str, expire_in_sec: int,
+                 max_connections: int | None = None,
+                 socket_timeout: float | None = None,
+                 socket_connect_timeout: float | None = None,
+                 local_cache: LocalCache | None = None,
+                 channel: str = INVALIDATION_CHANNEL,
+                 lock_timeout: float | None = None,
+                 soft_ttls: dict[str, float] | None = None,
+                 codec: Codec | None = None,
+                 prefix: str = '') -> None:
         self.expire_in_sec = expire_in_sec
-        self.redis: Redis = Redis(host=host, port=port, password=password)
+        self.prefix = prefix
+        pool = ConnectionPool(host=host, port=port, password=password,
+                              max_connections=max_connections,
+                              socket_timeout=socket_timeout,
+                              socket_connect_timeout=socket_connect_timeout)
+        self.redis: Redis = Redis(connection_pool=pool)
+        self.local = local_cache
+        self.channel = channel
+        self.lock_timeout = lock_timeout
+        self.single_flight = SingleFlight()
+        self.soft_ttls = soft_ttls or {}
+        self.codec = codec or JsonCodec()
+        self.refresh_tasks: dict[str, asyncio.Task] = {}
+
+    async def close(self) -> None:
+        await self.redis.close()
+        await self.redis.connection_pool.disconnect()
+
+    async def set_key(self, key: str, value: Any) -> None:
+        await self.set_many({key: value})
+
+    async def set_all(self, list_name: str, values: list | Any) -> None:
+        await self.set_many({list_name: values})
 
     @backoff.on_exception(backoff.expo,
                           (BusyLoadingError, ConnectionError, TimeoutError),
                           max_tries=5,
                           raise_on_giveup=True)
-    async def set_key(self, key: str | UUID, value: Any) -> None:
-        data: str = json.dumps(jsonable_encoder(value))
-        await self.redis.set(key, data, self.expire_in_sec)
+    async def is_exists(self, key: str) -> bool:
+        return await self.redis.exists(with_prefix(key, self.prefix))
+
+    async def get_value(self, key: str, codec: Codec | None = None) -> Any:
+        values = await self.get_many([key], decode=codec.decode if codec is not None else None)
+        return values[0]
+
+    async def delete_cache(self, name: str) -> Any:
+        await self.delete_many([name])
 
     @backoff.on_exception(backoff.expo,
                           (BusyLoadingError, ConnectionError, TimeoutError),
                           max_tries=5,
                           raise_on_giveup=True)
-    async def set_all(self, list_name: str, values: list | Any) -> None:
-        data = json.dumps(jsonable_encoder(values))
-        await self.redis.set(list_name, data, self.expire_in_sec)
+    async def get_many(
+            self, keys: list[str], decode: Callable[[bytes], Any] | None = None
+    ) -> list[Any]:
+        decode = decode or self.codec.decode
+        values = [self.local.get(key) if self.local else None for key in keys]
+        missing = [index for index, value in enumerate(values) if value is None]
+        if not missing:
+            return values
+        found = await self.redis.mget([with_prefix(keys[index], self.prefix) for index in missing])
+        for index, value in zip(missing, found):
+            if value:
+                values[index] = decode(value)
+                if self.local is not None:
+                    self.local.set(keys[index], values[index], len(value))
+        return values
 
     @backoff.on_exception(backoff.expo,
                           (BusyLoadingError, ConnectionError, TimeoutError),
                           max_tries=5,
                           raise_on_giveup=True)
-    async def is_exists(self, key: str) -> bool:
-        return await self.redis.exists(key)
+    async def set_many(self, items: dict[str, Any], codec: Codec | None = None) -> None:
+        if not items:
+            return
+        codec = codec or self.codec
+        encoded = {key: codec.encode(value) for key, value in items.items()}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, data in encoded.items():
+                pipe.set(with_prefix(key, self.prefix), data, self.expire_in_sec)
+            await pipe.execute()
+        if self.local is not None:
+            for key, data in encoded.items():
+                self.local.set(key, codec.decode(data), len(data))
 
     @backoff.on_exception(backoff.expo,
                           (BusyLoadingError, ConnectionError, TimeoutError),
                           max_tries=5,
                           raise_on_giveup=True)
-    async def get_value(self, key: str | UUID) -> Any:
-        value = await self.redis.get(key)
-        return json.loads(value) if value else None
+    async def delete_many(self, keys: list[str]) -> None:
+        if not keys:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.unlink(*[with_prefix(key, self.prefix) for key in keys])
+            pipe.publish(self.channel, json.dumps(keys))
+            await pipe.execute()
+        if self.local is not None:
+            self.local.delete(*keys)
+
+    async def get_or_load(
+            self,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            related: Callable[[Any], dict[str, Any]] | None = None,
+            policy: str | None = None,
+            refresher: Callable[[], Awaitable[Any]] | None = None,
+            raw: bool = False,
+            if_none_match: str | None = None,
+            cursor: Callable[[Any], str | None] | None = None,
+    ) -> CacheResult:
+        etag = make_etag(key)
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            return CacheResult(value=None, etag=etag, not_modified=True)
+        soft_ttl = self.soft_ttls.get(policy) if policy else None
+        codec = RAW_ENTRY_CODEC if raw else self.codec
+        entry = await self.get_value(key, codec)
+        if entry:
+            if refresher is not None and entry['refresh_at'] is not None and entry['refresh_at'] <= time.time():
+                self._schedule_refresh(key, as_entry(refresher, soft_ttl, raw, cursor), entry_related(related), codec)
+        else:
+            entry = await self.single_flight.do(
+                key, lambda: self._load(key, as_entry(loader, soft_ttl, raw, cursor), entry_related(related), codec)
+            )
+        # '*' only matches a resource that exists, so it is checked once the loader has not raised a 404.
+        return CacheResult(value=entry['value'], etag=etag, last_modified=entry['loaded_at'],
+                           not_modified=if_none_match is not None and etag_any(if_none_match),
+                           next_cursor=entry.get('next_cursor'))
+
+    def _schedule_refresh(
+            self,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            related: Callable[[Any], dict[str, Any]] | None,
+            codec: Codec,
+    ) -> None:
+        if key in self.refresh_tasks:
+            return
+        task = asyncio.create_task(self.single_flight.do(key, lambda: self._load(key, loader, related, codec)))
+        self.refresh_tasks[key] = task
+        task.add_done_callback(lambda done: self._refresh_done(key, done))
+
+    def _refresh_done(self, key: str, task: asyncio.Task) -> None:
+        self.refresh_tasks.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error('Background refresh of %s failed, serving the stale entry', key,
+                         exc_info=task.exception())
+
+    async def _load(
+            self,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            related: Callable[[Any], dict[str, Any]] | None,
+            codec: Codec,
+    ) -> Any:
+        if self.lock_timeout is None:
+            return await self._load_and_store(key, loader, related, codec)
+
+        lock = self.redis.lock(with_prefix(lock_key(key), self.prefix), timeout=self.lock_timeout)
+        if await lock.acquire(blocking=False):
+            return await self._load_locked(lock, key, loader, related, codec)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            value = await self.get_value(key, codec)
+            if value:
+                return value
+            # A released lock with nothing stored means the holder's loader raised.
+            if not await lock.locked() and await lock.acquire(blocking=False):
+                value = await self.get_value(key, codec)
+                if value:
+                    await self._release(lock)
+                    return value
+                return await self._load_locked(lock, key, loader, related, codec)
+        return await self._load_and_store(key, loader, related, codec)
+
+    async def _load_locked(
+            self,
+            lock: Lock,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            related: Callable[[Any], dict[str, Any]] | None,
+            codec: Codec,
+    ) -> Any:
+        try:
+            return await self._load_and_store(key, loader, related, codec)
+        finally:
+            await self._release(lock)
+
+    @staticmethod
+    async def _release(lock: Lock) -> None:
+        try:
+            await lock.release()
+        except LockError:
+            pass
+
+    async def _load_and_store(
+            self,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            related: Callable[[Any], dict[str, Any]] | None,
+            codec: Codec,
+    ) -> Any:
+        value = await loader()
+        items = {key: value}
+        if related is not None:
+            items.update(related(value))
+        await self.set_many(items, codec)
+        return value
+
+    async def versioned_key(self, key: str, *scopes: str) -> str:
+        return with_version(key, await self.version(*scopes))
+
+    async def version(self, *scopes: str) -> str:
+        scopes = (NAMESPACE_SCOPE, *scopes)
+        keys = [*map(generation_key, scopes), *map(written_key, scopes)]
+        epoch, *values = await self.get_many([EPOCH_KEY, *keys], decode=decode_number)
+        if epoch is None:
+            epoch = await self._init_epoch()
+        if self.local is not None:
+            for key, value in zip(keys, values):
+                if value is None:
+                    self.local.set(key, 0)
+        generations, written_at = values[:len(scopes)], values[len(scopes):]
+        note_write(max(value or 0.0 for value in written_at))
+        return f'v{epoch:x}.' + '.'.join(str(gen or 0) for gen in generations)
 
     @backoff.on_exception(backoff.expo,
                           (BusyLoadingError, ConnectionError, TimeoutError),
                           max_tries=5,
                           raise_on_giveup=True)
-    async def delete_cache(self, name: str) -> Any:
-        await self.redis.delete(name)
+    async def _init_epoch(self) -> int:
+        # Generations restart from zero when Redis loses its data; a fresh epoch keeps
+        # the versioned keys, and the ETags derived from them, from repeating.
+        key = with_prefix(EPOCH_KEY, self.prefix)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, time.time_ns(), nx=True)
+            pipe.get(key)
+            _, epoch = await pipe.execute()
+        if self.local is not None:
+            self.local.set(EPOCH_KEY, int(epoch), len(epoch))
+        return int(epoch)
 
     @backoff.on_exception(backoff.expo,
                           (BusyLoadingError, ConnectionError, TimeoutError),
                           max_tries=5,
                           raise_on_giveup=True)
-    async def delete_all(self) -> Any:
-        await self.redis.flushall(asynchronous=True)
+    async def bump(self, *scopes: str) -> None:
+        # The write time per scope lets version() send only the reads that depend on
+        # these scopes to the primary while replicas may still lag behind.
+        keys = [generation_key(scope) for scope in scopes]
+        written_keys = [written_key(scope) for scope in scopes]
+        written_at = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for key in keys:
+                pipe.incr(with_prefix(key, self.prefix))
+            for key in written_keys:
+                pipe.set(with_prefix(key, self.prefix), written_at, self.expire_in_sec)
+            pipe.publish(self.channel, json.dumps([*keys, *written_keys]))
+            await pipe.execute()
+        if self.local is not None:
+            self.local.delete(*keys, *written_keys)
 
+    async def invalidate_namespace(self) -> None:
+        await self.bump(NAMESPACE_SCOPE)
 
-@backoff.on_exception(backoff.expo, ConnectionError, max_tries=5, raise_on_giveup=True)
-def get_redis() -> RedisDB:
+    async def listen_invalidations(self) -> None:
+        local = self.local
+        if local is None:
+            return
+        while True:
+            try:
+                await self._listen_invalidations(local)
+            except asyncio.CancelledError:
+                raise
+            except (ConnectionError, TimeoutError):
+                local.clear()
+                await asyncio.sleep(1)
+            except Exception:
+                logger.exception('Cache invalidation listener failed, resubscribing')
+                local.clear()
+                await asyncio.sleep(1)
+
+    async def _listen_invalidations(self, local: LocalCache) -> None:
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            local.clear()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+                local.delete(*json.loads(message['data']))
+        finally:
+            await pubsub.reset()
+
+
+def create_redis() -> RedisDB:
+    local_cache = None
+    if settings.redis.local_cache_size > 0:
+        local_cache = LocalCache(max_size=settings.redis.local_cache_size,
+                                 ttl=settings.redis.local_cache_ttl,
+                                 max_bytes=settings.redis.local_cache_max_bytes)
     return RedisDB(host=settings.redis.host,
                    port=settings.redis.port,
                    password=settings.redis.password.get_secret_value(),
-                   expire_in_sec=settings.redis.expire_in_sec)
+                   expire_in_sec=settings.redis.expire_in_sec,
+                   max_connections=settings.redis.max_connections,
+                   socket_timeout=settings.redis.socket_timeout,
+                   socket_connect_timeout=settings.redis.socket_connect_timeout,
+                   local_cache=local_cache,
+                   channel=settings.redis.invalidation_channel,
+                   lock_timeout=settings.redis.lock_timeout if settings.redis.distributed_lock else None,
+                   soft_ttls=settings.redis.stale_while_revalidate,
+                   codec=get_codec(settings.redis.codec),
+                   prefix=settings.redis.key_prefix)
+
+
+redis_db: RedisDB | None = None
+
+
+def init_redis() -> RedisDB:
+    global redis_db
+    if redis_db is None:
+        redis_db = create_redis()
+    return redis_db
+
+
+async def close_redis() -> None:
+    global redis_db
+    if redis_db is not None:
+        await redis_db.close()
+        redis_db = None
+
+
+@backoff.on_exception(backoff.expo, ConnectionError, max_tries=5, raise_on_giveup=True)
+def get_redis() -> RedisDB:
+    return init_redis()
@@ -0,0 +1,23 @@
+from sqlalchemy import Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+SEARCH_CONFIG = 'russian'
+
+TRGM_EXTENSION = 'CREATE EXTENSION IF NOT EXISTS pg_trgm'
+
+SEARCH_VECTOR = f"to_tsvector('{SEARCH_CONFIG}', title || ' ' || description)"
+
+
+def search_vector_column() -> Mapped[str]:
+    return mapped_column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), deferred=True)
+
+
+def search_indexes(table: str) -> tuple[Index, ...]:
+    return (
+        Index(f'ix_{table}_search_vector', 'search_vector', postgresql_using='gin'),
+        Index(f'ix_{table}_title_trgm', 'title',
+              postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index(f'ix_{table}_description_trgm', 'description',
+              postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
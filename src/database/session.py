@@ -1,8 +1,14 @@
+import itertools
+import time
 from asyncio import current_task
-from dataclasses import dataclass
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Annotated, Any, AsyncGenerator, AsyncIterator, Callable
 
+from fastapi import Header
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
     async_sessionmaker,
@@ -10,39 +16,129 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from src.core.config import settings
+from src.database.consistency import scope_written_at, token_time
+from src.database.pool import TimedAsyncQueuePool
 
 
 @dataclass()
 class DatabaseHelper:
     url: str
     echo: bool
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    connect_timeout: float = 60.0
+    command_timeout: float | None = None
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
+
+    replica_urls: list[str] = field(default_factory=list)
+    replica_lag: float = 5.0
 
     def __post_init__(self) -> None:
-        self.engine = create_async_engine(url=self.url, echo=self.echo)
-        self.async_session = async_sessionmaker(
-            self.engine,
+        self.engine = self._create_engine(self.url)
+        self.async_session = self._create_sessionmaker(self.engine)
+        self.replica_engines = [self._create_engine(url) for url in self.replica_urls]
+        self.replica_sessions = [self._create_sessionmaker(engine) for engine in self.replica_engines]
+        self._replicas = itertools.cycle(self.replica_sessions)
+        self._session_factory: ContextVar[Callable[[], AsyncSession]] = ContextVar('session_factory')
+        self.session = async_scoped_session(self._create_session, scopefunc=current_task)
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        return create_async_engine(
+            url=url,
+            echo=self.echo,
+            poolclass=TimedAsyncQueuePool,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping,
+            connect_args={
+                'timeout': self.connect_timeout,
+                'command_timeout': self.command_timeout,
+                'statement_cache_size': self.statement_cache_size,
+                'prepared_statement_cache_size': self.prepared_statement_cache_size,
+            },
+        )
+
+    @staticmethod
+    def _create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            engine,
             expire_on_commit=False,
             class_=AsyncSession,
             autocommit=False,
             autoflush=False,
         )
 
+    def read_sessionmaker(self, written_at: float = 0.0) -> async_sessionmaker[AsyncSession]:
+        if not self.replica_sessions or time.time() - written_at < self.replica_lag:
+            return self.async_session
+        return next(self._replicas)
+
+    def pool_stats(self) -> dict[str, Any]:
+        return {
+            **self.engine.pool.stats(),
+            'replicas': [engine.pool.stats() for engine in self.replica_engines],
+        }
+
+    async def dispose(self) -> None:
+        for engine in (self.engine, *self.replica_engines):
+            await engine.dispose()
+
     async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.async_session() as session:
             yield session
 
-    async def scoped_session_dependency(self):
-        scoped_factory = async_scoped_session(
-            self.async_session,
-            scopefunc=current_task,
-        )
+    def _create_session(self) -> AsyncSession:
+        return self._session_factory.get(self.async_session)()
+
+    @asynccontextmanager
+    async def bind(
+            self, session_factory: Callable[[], AsyncSession]
+    ) -> AsyncIterator[async_scoped_session[AsyncSession]]:
+        self._session_factory.set(session_factory)
         try:
-            async with scoped_factory() as session:
-                yield session
+            yield self.session
         finally:
-            await scoped_factory.remove()
+            await self.session.remove()
+
+    async def scoped_session_dependency(self):
+        async with self.bind(self.async_session) as session:
+            yield session
+
+    async def read_session_dependency(
+            self,
+            x_consistency_token: Annotated[str | None, Header()] = None,
+    ):
+        # The session opens lazily, after the service has read the versions of the cache
+        # scopes it depends on, so a recent write to one of them can still pin it to the primary.
+        written_at = token_time(x_consistency_token)
+        async with self.bind(lambda: self.read_sessionmaker(max(written_at, scope_written_at()))()) as session:
+            yield session
+
+    async def read_sessionmaker_dependency(
+            self,
+            x_consistency_token: Annotated[str | None, Header()] = None,
+    ) -> async_sessionmaker[AsyncSession]:
+        return self.read_sessionmaker(token_time(x_consistency_token))
 
 
 db_helper: DatabaseHelper = DatabaseHelper(
-    url=settings.db.async_url, echo=settings.db.echo
+    url=settings.db.async_url,
+    echo=settings.db.echo,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    connect_timeout=settings.db.connect_timeout,
+    command_timeout=settings.db.command_timeout,
+    statement_cache_size=settings.db.statement_cache_size,
+    prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
+    replica_urls=settings.db.replica_urls,
+    replica_lag=settings.db.replica_lag,
 )
@@ -0,0 +1,19 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class BulkResult(BaseModel):
+    id: UUID
+    status: bool
+    message: str
+
+
+def bulk_results(
+        ids: list[UUID], found: set[UUID], message: str, not_found: str
+) -> list[BulkResult]:
+    return [
+        BulkResult(id=item_id, status=item_id in found,
+                   message=message if item_id in found else not_found)
+        for item_id in ids
+    ]
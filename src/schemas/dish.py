@@ -1,18 +1,28 @@
+from decimal import Decimal
+from typing import Annotated, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+Price = Annotated[Decimal, Field(max_digits=10, decimal_places=2)]
+
+DishSort = Literal['id', 'price', '-price']
 
 
 class DishCreate(BaseModel):
     title: str
     description: str
-    price: str
+    price: Price
 
 
 class DishUpdate(BaseModel):
     title: str | None
     description: str | None
-    price: str | None
+    price: Price | None
+
+
+class DishBulkUpdate(DishUpdate):
+    id: UUID
 
 
 class DishResponse(BaseModel):
@@ -21,6 +31,11 @@ class DishResponse(BaseModel):
     description: str
     price: str
 
+    @field_validator('price', mode='before')
+    @classmethod
+    def format_price(cls, value: Decimal | str) -> str:
+        return f'{value:.2f}' if isinstance(value, Decimal) else value
+
     model_config = ConfigDict(
         from_attributes=True, revalidate_instances="always"
     )
@@ -15,6 +15,10 @@ class MenuUpdate(BaseModel):
     description: str | None
 
 
+class MenuBulkUpdate(MenuUpdate):
+    id: UUID
+
+
 class MenuResponse(BaseModel):
     id: UUID
     title: str
@@ -0,0 +1,16 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SearchHit(BaseModel):
+    type: Literal['menu', 'submenu', 'dish']
+    id: UUID
+    title: str
+    description: str
+    menu_id: UUID | None
+    submenu_id: UUID | None
+    rank: float
+
+    model_config = ConfigDict(from_attributes=True)
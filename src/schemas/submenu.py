@@ -37,3 +37,7 @@ class SubmenuCreate(BaseModel):
 class SubmenuUpdate(BaseModel):
     title: str | None
     description: str | None
+
+
+class SubmenuBulkUpdate(SubmenuUpdate):
+    id: UUID
@@ -1,14 +1,35 @@
 from abc import ABCMeta, abstractmethod
+from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends, HTTPException, status
+from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
 from src.crud.dish import DishDAL
-from src.database.redis_cache import RedisDB, get_redis
+from src.crud.raw import DishRawDAL
+from src.database.redis_cache import (
+    GLOBAL_SCOPE,
+    CacheResult,
+    RedisDB,
+    dish_key,
+    dish_list_key,
+    get_redis,
+    menu_scope,
+    page_key,
+    submenu_scope,
+    with_version,
+)
 from src.database.session import db_helper
-from src.schemas.dish import DishCreate, DishResponse
+from src.schemas.bulk import BulkResult, bulk_results
+from src.schemas.dish import DishCreate, DishResponse, DishSort
+from src.service.pagination import (
+    decode_cursor,
+    decode_price_cursor,
+    next_cursor,
+    next_price_cursor,
+)
 
 
 class DishServiceBase(metaclass=ABCMeta):
@@ -32,6 +53,18 @@ class DishServiceBase(metaclass=ABCMeta):
     async def delete_dish(self, *args: Any, **kwargs: Any) -> Any:
         pass
 
+    @abstractmethod
+    async def create_dishes(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def update_dishes(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def delete_dishes(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
 
 class DishService(DishServiceBase):
     def __init__(self, session: AsyncSession, cache: RedisDB) -> None:
@@ -39,85 +72,144 @@ class DishService(DishServiceBase):
         self.cache = cache
 
     async def create_dish(
-        self, menu_id: UUID, submenu_id: UUID, dish_body: DishCreate, back_tasks: BackgroundTasks
+        self, menu_id: UUID, submenu_id: UUID, dish_body: DishCreate
     ) -> DishResponse:
         dish_crud = DishDAL(self.session)
         dish = await dish_crud.create(submenu_id, dish_body)
-        back_tasks.add_task(self.cache.delete_cache, 'menu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'submenu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'dish_list')
-        back_tasks.add_task(self.cache.delete_cache, 'full_menus_submenus_dishes')
-        back_tasks.add_task(self.cache.delete_cache, f'submenu_{submenu_id}')
-        back_tasks.add_task(self.cache.delete_cache, f'menu_{menu_id}')
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
         return DishResponse.model_validate(dish)
 
     async def get_dish(
-        self, submenu_id: UUID, dish_id: UUID
-    ) -> DishResponse | Exception:
-        cache_dish = await self.cache.get_value(f'dish_{dish_id}')
-        if cache_dish:
-            data_dish = cache_dish
-        else:
-            dish_crud = DishDAL(self.session)
-            dish = await dish_crud.get(submenu_id, dish_id)
-            if dish is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail='dish not found'
-                )
-            data_dish = DishResponse.model_validate(dish)
-            await self.cache.set_key(f'dish_{dish_id}', data_dish)
-        return data_dish
+        self, menu_id: UUID, submenu_id: UUID, dish_id: UUID, if_none_match: str | None = None
+    ) -> CacheResult:
+        key = await self.cache.versioned_key(
+            dish_key(dish_id), menu_scope(menu_id), submenu_scope(submenu_id)
+        )
+        return await self.cache.get_or_load(
+            key, lambda: self._load_dish(submenu_id, dish_id), if_none_match=if_none_match
+        )
+
+    async def _load_dish(self, submenu_id: UUID, dish_id: UUID) -> DishResponse:
+        dish_crud = DishDAL(self.session)
+        dish = await dish_crud.get(submenu_id, dish_id)
+        if dish is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail='dish not found'
+            )
+        return DishResponse.model_validate(dish)
 
     async def get_dish_list(
-        self, submenu_id: UUID, offset: int, limit: int
+        self, menu_id: UUID, submenu_id: UUID, offset: int, limit: int,
+        cursor: str | None = None, if_none_match: str | None = None,
+        min_price: Decimal | None = None, max_price: Decimal | None = None, sort: DishSort = 'id',
+    ) -> CacheResult:
+        after, after_price = None, None
+        if cursor is not None and sort == 'id':
+            after = decode_cursor(cursor)
+        elif cursor is not None:
+            after_price, after = decode_price_cursor(cursor)
+        version = await self.cache.version(menu_scope(menu_id), submenu_scope(submenu_id))
+        key = with_version(
+            page_key(dish_list_key(submenu_id, sort, min_price, max_price), offset, limit, after, after_price), version
+        )
+        return await self.cache.get_or_load(
+            key,
+            lambda: self._load_dish_list(submenu_id, offset, limit, after, min_price, max_price, sort, after_price),
+            related=lambda dishes: {
+                with_version(dish_key(dish.id), version): dish for dish in dishes
+            },
+            if_none_match=if_none_match,
+            cursor=next_cursor(limit) if sort == 'id' else next_price_cursor(limit),
+        )
+
+    def _read_crud(self) -> DishDAL | DishRawDAL:
+        if settings.app.read_backend == 'asyncpg':
+            return DishRawDAL(self.session)
+        return DishDAL(self.session)
+
+    async def _load_dish_list(
+        self, submenu_id: UUID, offset: int, limit: int, after: UUID | None = None,
+        min_price: Decimal | None = None, max_price: Decimal | None = None, sort: DishSort = 'id',
+        after_price: Decimal | None = None,
     ) -> list[DishResponse]:
-        cache_dish_list = await self.cache.get_value('dish_list')
-        if cache_dish_list:
-            data_dish_list = cache_dish_list
-        else:
-            dish_crud = DishDAL(self.session)
-            dish_list = await dish_crud.get_list(submenu_id, offset, limit)
-            data_dish_list = [DishResponse.model_validate(dish) for dish in dish_list]
-            await self.cache.set_all('dish_list', data_dish_list)
-        return data_dish_list
+        dish_crud = self._read_crud()
+        dish_list = await dish_crud.get_list(submenu_id, offset, limit, after, min_price, max_price, sort, after_price)
+        return [DishResponse.model_validate(dish) for dish in dish_list]
 
     async def update_dish(
-        self, submenu_id: UUID, dish_id: UUID, dish_body: dict[str, str], back_tasks: BackgroundTasks
+        self, submenu_id: UUID, dish_id: UUID, dish_body: dict[str, str]
     ) -> DishResponse | Exception:
         dish_crud = DishDAL(self.session)
-        dish = await dish_crud.get(submenu_id, dish_id)
-        if dish is None:
+        dish_updated = await dish_crud.update(submenu_id, dish_id, dish_body)
+        if dish_updated is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail='dish not found'
             )
-        dish_updated = await dish_crud.update(submenu_id, dish_id, dish_body)
         data_dish_updated = DishResponse.model_validate(dish_updated)
-        await self.cache.set_key(f'dish_{dish_id}', data_dish_updated)
-        back_tasks.add_task(self.cache.delete_cache, 'dish_list')
+        await self.cache.bump(GLOBAL_SCOPE, submenu_scope(submenu_id))
         return data_dish_updated
 
     async def delete_dish(
-        self, menu_id: UUID, submenu_id: UUID, dish_id: UUID, back_tasks: BackgroundTasks
+        self, menu_id: UUID, submenu_id: UUID, dish_id: UUID
     ) -> Exception | None | UUID:
         dish_crud = DishDAL(self.session)
-        dish = await dish_crud.get(submenu_id, dish_id)
-        if dish is None:
+        dish_deleted_id = await dish_crud.delete(submenu_id, dish_id)
+        if dish_deleted_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail='dish not found'
             )
-        dish_deleted_id = await dish_crud.delete(submenu_id, dish_id)
-        back_tasks.add_task(self.cache.delete_cache, f'menu_{menu_id}')
-        back_tasks.add_task(self.cache.delete_cache, f'submenu_{submenu_id}')
-        back_tasks.add_task(self.cache.delete_cache, f'dish_{dish_id}')
-        back_tasks.add_task(self.cache.delete_cache, 'menu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'submenu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'dish_list')
-        back_tasks.add_task(self.cache.delete_cache, 'full_menus_submenus_dishes')
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
         return dish_deleted_id
 
+    async def create_dishes(
+        self, menu_id: UUID, submenu_id: UUID, bodies: list[DishCreate]
+    ) -> list[DishResponse]:
+        dish_crud = DishDAL(self.session)
+        dishes = await dish_crud.create_many(submenu_id, bodies)
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
+        return [DishResponse.model_validate(dish) for dish in dishes]
+
+    async def update_dishes(
+        self, submenu_id: UUID, bodies: list[dict[str, Any]]
+    ) -> list[BulkResult]:
+        dish_crud = DishDAL(self.session)
+        updated_ids = await dish_crud.update_many(submenu_id, bodies)
+        if updated_ids:
+            await self.cache.bump(GLOBAL_SCOPE, submenu_scope(submenu_id))
+        return bulk_results([body['id'] for body in bodies], updated_ids,
+                            'The dish has been updated', 'dish not found')
+
+    async def delete_dishes(
+        self, menu_id: UUID, submenu_id: UUID, dish_ids: list[UUID]
+    ) -> list[BulkResult]:
+        dish_crud = DishDAL(self.session)
+        deleted_ids = await dish_crud.delete_many(submenu_id, dish_ids)
+        if deleted_ids:
+            await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
+        return bulk_results(dish_ids, deleted_ids, 'The dish has been deleted', 'dish not found')
+
+
+dish_service: DishService | None = None
+
+
+def init_dish_service(session: AsyncSession, cache: RedisDB) -> DishService:
+    # One service per worker: session is the scoped-session proxy that the session
+    # dependencies bind to each request, so only a new Redis client replaces it.
+    global dish_service
+    if dish_service is None or dish_service.cache is not cache:
+        dish_service = DishService(session, cache=cache)
+    return dish_service
+
 
 def get_dish_service(
     session: AsyncSession = Depends(db_helper.scoped_session_dependency),
     redis_cache: RedisDB = Depends(get_redis)
 ) -> DishService:
-    return DishService(session, cache=redis_cache)
+    return init_dish_service(session, redis_cache)
+
+
+def get_dish_read_service(
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+    redis_cache: RedisDB = Depends(get_redis)
+) -> DishService:
+    return init_dish_service(session, redis_cache)
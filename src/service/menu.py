@@ -1,15 +1,29 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.core.config import settings
 from src.crud.menu import MenuDAL
-from src.database.models.menu import Menu
-from src.database.redis_cache import RedisDB, get_redis
+from src.crud.raw import MenuRawDAL
+from src.database.consistency import scope_written_at
+from src.database.redis_cache import (
+    FULL_MENUS_SUBMENUS_DISHES,
+    GLOBAL_SCOPE,
+    MENU_LIST,
+    CacheResult,
+    RedisDB,
+    get_redis,
+    menu_key,
+    menu_scope,
+    page_key,
+)
 from src.database.session import db_helper
+from src.schemas.bulk import BulkResult, bulk_results
 from src.schemas.menu import MenuCreate, MenuResponse, MenuSubmenuDishResponse
+from src.service.pagination import decode_cursor, next_cursor
 
 
 class MenuServiceBase(metaclass=ABCMeta):
@@ -33,96 +47,186 @@ class MenuServiceBase(metaclass=ABCMeta):
     async def delete_menu(self, *args: Any, **kwargs: Any) -> Any:
         pass
 
+    @abstractmethod
+    async def create_menus(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def update_menus(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def delete_menus(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
 
 class MenuService(MenuServiceBase):
     def __init__(self, session: AsyncSession, cache: RedisDB) -> None:
         self.session = session
         self.cache = cache
 
-    async def create_menu(self, body: MenuCreate, back_tasks: BackgroundTasks) -> MenuResponse:
+    async def create_menu(self, body: MenuCreate) -> MenuResponse:
         menu_crud = MenuDAL(self.session)
         menu = await menu_crud.create(body)
-        back_tasks.add_task(self.cache.delete_cache, 'menu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'full_menus_submenus_dishes')
+        await self.cache.bump(GLOBAL_SCOPE)
         return MenuResponse.model_validate(menu)
 
-    async def get_menu(self, menu_id: UUID) -> MenuResponse | Exception:
-        cache_menu = await self.cache.get_value(f'menu_{menu_id}')
-        if cache_menu:
-            data_menu = cache_menu
-        else:
-            menu_crud = MenuDAL(self.session)
-            menu = await self.session.get(Menu, menu_id)
-            if menu is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail='menu not found'
-                )
-            menu = await menu_crud.get(menu_id)
-            data_menu = MenuResponse.model_validate(menu)
-            await self.cache.set_key(f'menu_{menu_id}', data_menu)
-        return data_menu
+    async def get_menu(self, menu_id: UUID, if_none_match: str | None = None) -> CacheResult:
+        key = await self.cache.versioned_key(menu_key(menu_id), menu_scope(menu_id))
+        return await self.cache.get_or_load(key, lambda: self._load_menu(menu_id), if_none_match=if_none_match)
+
+    def _read_crud(self) -> MenuDAL | MenuRawDAL:
+        if settings.app.read_backend == 'asyncpg':
+            return MenuRawDAL(self.session)
+        return MenuDAL(self.session)
+
+    async def _load_menu(self, menu_id: UUID) -> MenuResponse:
+        menu_crud = self._read_crud()
+        menu = await menu_crud.get(menu_id)
+        if menu is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail='menu not found'
+            )
+        return MenuResponse.model_validate(menu)
 
     async def get_menus_list(
-            self, offset: int, limit: int
+            self, offset: int, limit: int, cursor: str | None = None, if_none_match: str | None = None
+    ) -> CacheResult:
+        after = decode_cursor(cursor) if cursor is not None else None
+        key = await self.cache.versioned_key(page_key(MENU_LIST, offset, limit, after), GLOBAL_SCOPE)
+        return await self.cache.get_or_load(
+            key,
+            lambda: self._load_menus_list(offset, limit, after),
+            policy=MENU_LIST,
+            refresher=lambda: self._refresh(lambda service: service._load_menus_list(offset, limit, after)),
+            raw=settings.redis.raw_responses,
+            if_none_match=if_none_match,
+            cursor=next_cursor(limit),
+        )
+
+    async def _load_menus_list(
+            self, offset: int, limit: int, after: UUID | None = None
     ) -> list[MenuResponse]:
-        cache_menu_list = await self.cache.get_value('menu_list')
-        if cache_menu_list:
-            data_menu_list = cache_menu_list
-        else:
-            menu_crud = MenuDAL(self.session)
-            menu_list = await menu_crud.get_list(offset, limit)
-            data_menu_list = [MenuResponse.model_validate(menu) for menu in menu_list]
-            await self.cache.set_all('menu_list', data_menu_list)
-        return data_menu_list
+        menu_crud = self._read_crud()
+        menu_list = await menu_crud.get_list(offset, limit, after)
+        return [MenuResponse.model_validate(menu) for menu in menu_list]
 
     async def update_menu(
-            self, menu_id: UUID, body: dict[str, str], back_tasks: BackgroundTasks
+            self, menu_id: UUID, body: dict[str, str]
     ) -> MenuResponse | Exception:
         menu_crud = MenuDAL(self.session)
-        menu = await self.session.get(Menu, menu_id)
-        if menu is None:
+        menu_updated = await menu_crud.update(menu_id, body)
+        if menu_updated is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail='menu not found'
             )
-        menu_updated = await menu_crud.update(menu_id, body)
         data_menu_update = MenuResponse.model_validate(menu_updated)
-        await self.cache.set_key(f'menu_{menu_id}', data_menu_update)
-        back_tasks.add_task(self.cache.delete_cache, 'menu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'full_menus_submenus_dishes')
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
         return data_menu_update
 
-    async def delete_menu(self, menu_id: UUID, back_tasks: BackgroundTasks) -> Exception | None | UUID:
+    async def delete_menu(self, menu_id: UUID) -> Exception | None | UUID:
         menu_crud = MenuDAL(self.session)
-        menu = await self.session.get(Menu, menu_id)
-        if menu is None:
+        menu_delete_id = await menu_crud.delete(menu_id)
+        if menu_delete_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail='menu not found'
             )
-        menu_delete_id = await menu_crud.delete(menu_id)
-        back_tasks.add_task(self.cache.delete_cache, f'menu_{menu_delete_id}')
-        back_tasks.add_task(self.cache.delete_cache, 'menu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'submenu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'dish_list')
-        back_tasks.add_task(self.cache.delete_cache, 'full_menus_submenus_dishes')
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
         return menu_delete_id
 
+    async def create_menus(self, bodies: list[MenuCreate]) -> list[MenuResponse]:
+        menu_crud = MenuDAL(self.session)
+        menus = await menu_crud.create_many(bodies)
+        await self.cache.bump(GLOBAL_SCOPE)
+        return [MenuResponse.model_validate(menu) for menu in menus]
+
+    async def update_menus(self, bodies: list[dict[str, Any]]) -> list[BulkResult]:
+        menu_crud = MenuDAL(self.session)
+        updated_ids = await menu_crud.update_many(bodies)
+        if updated_ids:
+            await self.cache.bump(GLOBAL_SCOPE, *[menu_scope(menu_id) for menu_id in updated_ids])
+        return bulk_results([body['id'] for body in bodies], updated_ids,
+                            'The menu has been updated', 'menu not found')
+
+    async def delete_menus(self, menu_ids: list[UUID]) -> list[BulkResult]:
+        menu_crud = MenuDAL(self.session)
+        deleted_ids = await menu_crud.delete_many(menu_ids)
+        if deleted_ids:
+            await self.cache.bump(GLOBAL_SCOPE, *[menu_scope(menu_id) for menu_id in deleted_ids])
+        return bulk_results(menu_ids, deleted_ids, 'The menu has been deleted', 'menu not found')
+
     async def full_menus_submenus_dishes(
+            self, offset: int, limit: int, if_none_match: str | None = None
+    ) -> CacheResult:
+        key = await self.cache.versioned_key(page_key(FULL_MENUS_SUBMENUS_DISHES, offset, limit), GLOBAL_SCOPE)
+        return await self.cache.get_or_load(
+            key,
+            lambda: self._load_full_menus_submenus_dishes(offset, limit),
+            policy=FULL_MENUS_SUBMENUS_DISHES,
+            refresher=lambda: self._refresh(
+                lambda service: service._load_full_menus_submenus_dishes(offset, limit)
+            ),
+            raw=settings.redis.raw_responses,
+            if_none_match=if_none_match,
+        )
+
+    async def stream_full_menus_submenus_dishes(
+            self,
+            session_factory: async_sessionmaker[AsyncSession],
+            offset: int,
+            limit: int | None,
+            array: bool = False,
+    ) -> AsyncIterator[str]:
+        async with session_factory() as session:
+            menus = MenuDAL(session).stream_full_menus_submenus_dishes(
+                offset, limit, settings.app.stream_batch_size
+            )
+            if not array:
+                async for menu in menus:
+                    yield menu + '\n'
+                return
+            separator = '['
+            async for menu in menus:
+                yield separator + menu
+                separator = ','
+            yield '[]' if separator == '[' else ']'
+
+    async def _refresh(self, load: Callable[['MenuService'], Awaitable[Any]]) -> Any:
+        session_factory = db_helper.read_sessionmaker(scope_written_at())
+        async with session_factory() as session:
+            return await load(MenuService(session, self.cache))
+
+    async def _load_full_menus_submenus_dishes(
             self, offset: int, limit: int
-    ) -> list[MenuResponse]:
-        full_menus_submenus_dishes = await self.cache.get_value('full_menus_submenus_dishes')
-        if full_menus_submenus_dishes:
-            data_full_menus_submenus_dishes = full_menus_submenus_dishes
-        else:
-            menu_crud = MenuDAL(self.session)
-            menus_submenus_dishes_list = await menu_crud.get_full_menus_submenus_dishes(offset, limit)
-            data_full_menus_submenus_dishes = [MenuSubmenuDishResponse.model_validate(
-                menu) for menu in menus_submenus_dishes_list]
-            await self.cache.set_all('full_menus_submenus_dishes', data_full_menus_submenus_dishes)
-        return data_full_menus_submenus_dishes
+    ) -> list[MenuSubmenuDishResponse] | str:
+        menu_crud = MenuDAL(self.session)
+        if settings.app.full_tree_engine == 'json':
+            return await menu_crud.get_full_menus_submenus_dishes_json(offset, limit)
+        menus_submenus_dishes_list = await menu_crud.get_full_menus_submenus_dishes(offset, limit)
+        return [MenuSubmenuDishResponse.model_validate(menu) for menu in menus_submenus_dishes_list]
+
+
+menu_service: MenuService | None = None
+
+
+def init_menu_service(session: AsyncSession, cache: RedisDB) -> MenuService:
+    # One service per worker: session is the scoped-session proxy that the session
+    # dependencies bind to each request, so only a new Redis client replaces it.
+    global menu_service
+    if menu_service is None or menu_service.cache is not cache:
+        menu_service = MenuService(session, cache=cache)
+    return menu_service
 
 
 def get_menu_service(
         session: AsyncSession = Depends(db_helper.scoped_session_dependency),
         redis_cache: RedisDB = Depends(get_redis),
 ) -> MenuService:
-    return MenuService(session, cache=redis_cache)
+    return init_menu_service(session, redis_cache)
+
+
+def get_menu_read_service(
+        session: AsyncSession = Depends(db_helper.read_session_dependency),
+        redis_cache: RedisDB = Depends(get_redis),
+) -> MenuService:
+    return init_menu_service(session, redis_cache)
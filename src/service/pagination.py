@@ -0,0 +1,51 @@
+import base64
+import binascii
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(last_id: UUID) -> str:
+    return base64.urlsafe_b64encode(last_id.bytes).decode().rstrip('=')
+
+
+def encode_price_cursor(price: Decimal | str, last_id: UUID) -> str:
+    return base64.urlsafe_b64encode(last_id.bytes + str(price).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> UUID:
+    try:
+        return UUID(bytes=_b64decode(cursor))
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='invalid cursor'
+        )
+
+
+def decode_price_cursor(cursor: str) -> tuple[Decimal, UUID]:
+    try:
+        data = _b64decode(cursor)
+        price = Decimal(data[16:].decode())
+        if not price.is_finite():
+            raise ValueError(price)
+        return price, UUID(bytes=data[:16])
+    except (binascii.Error, ValueError, InvalidOperation):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='invalid cursor'
+        )
+
+
+def _b64decode(cursor: str) -> bytes:
+    return base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+
+
+def next_cursor(limit: int) -> Callable[[list[Any]], str | None]:
+    return lambda items: encode_cursor(items[-1].id) if items and len(items) == limit else None
+
+
+def next_price_cursor(limit: int) -> Callable[[list[Any]], str | None]:
+    return lambda items: (
+        encode_price_cursor(items[-1].price, items[-1].id) if items and len(items) == limit else None
+    )
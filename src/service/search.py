@@ -0,0 +1,65 @@
+from abc import ABCMeta, abstractmethod
+from typing import Any
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.crud.search import SearchDAL
+from src.database.redis_cache import (
+    GLOBAL_SCOPE,
+    CacheResult,
+    RedisDB,
+    get_redis,
+    page_key,
+    search_key,
+)
+from src.database.session import db_helper
+from src.schemas.search import SearchHit
+
+
+class SearchServiceBase(metaclass=ABCMeta):
+    @abstractmethod
+    async def search(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+
+class SearchService(SearchServiceBase):
+    def __init__(self, session: AsyncSession, cache: RedisDB) -> None:
+        self.session = session
+        self.cache = cache
+
+    async def search(
+            self, phrase: str, offset: int, limit: int, if_none_match: str | None = None
+    ) -> CacheResult:
+        key = await self.cache.versioned_key(page_key(search_key(phrase), offset, limit), GLOBAL_SCOPE)
+        return await self.cache.get_or_load(
+            key,
+            lambda: self._load_search(phrase, offset, limit),
+            raw=settings.redis.raw_responses,
+            if_none_match=if_none_match,
+        )
+
+    async def _load_search(self, phrase: str, offset: int, limit: int) -> list[SearchHit]:
+        search_crud = SearchDAL(self.session)
+        hits = await search_crud.search(phrase, offset, limit)
+        return [SearchHit.model_validate(hit) for hit in hits]
+
+
+search_service: SearchService | None = None
+
+
+def init_search_service(session: AsyncSession, cache: RedisDB) -> SearchService:
+    # One service per worker: session is the scoped-session proxy that the session
+    # dependencies bind to each request, so only a new Redis client replaces it.
+    global search_service
+    if search_service is None or search_service.cache is not cache:
+        search_service = SearchService(session, cache=cache)
+    return search_service
+
+
+def get_search_read_service(
+        session: AsyncSession = Depends(db_helper.read_session_dependency),
+        redis_cache: RedisDB = Depends(get_redis),
+) -> SearchService:
+    return init_search_service(session, redis_cache)
@@ -2,13 +2,25 @@ from abc import ABCMeta, abstractmethod
 from typing import Any
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends, HTTPException, status
+from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.submenu import SubmenuDAL
-from src.database.redis_cache import RedisDB, get_redis
+from src.database.redis_cache import (
+    GLOBAL_SCOPE,
+    CacheResult,
+    RedisDB,
+    get_redis,
+    menu_scope,
+    page_key,
+    submenu_key,
+    submenu_list_key,
+    with_version,
+)
 from src.database.session import db_helper
+from src.schemas.bulk import BulkResult, bulk_results
 from src.schemas.submenu import SubmenuCreate, SubmenuResponse
+from src.service.pagination import decode_cursor, next_cursor
 
 
 class SubmenuServiceBase(metaclass=ABCMeta):
@@ -32,6 +44,18 @@ class SubmenuServiceBase(metaclass=ABCMeta):
     async def delete_submenu(self, *args: Any, **kwargs: Any) -> Any:
         pass
 
+    @abstractmethod
+    async def create_submenus(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def update_submenus(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def delete_submenus(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
 
 class SubmenuService(SubmenuServiceBase):
     def __init__(self, session: AsyncSession, cache: RedisDB):
@@ -39,50 +63,22 @@ class SubmenuService(SubmenuServiceBase):
         self.cache = cache
 
     async def create_submenu(
-            self, menu_id: UUID, submenu_body: SubmenuCreate, back_tasks: BackgroundTasks
+            self, menu_id: UUID, submenu_body: SubmenuCreate
     ) -> SubmenuResponse:
         submenu_crud = SubmenuDAL(self.session)
         submenu = await submenu_crud.create(menu_id, submenu_body)
-        back_tasks.add_task(self.cache.delete_cache, 'menu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'submenu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'full_menus_submenus_dishes')
-        back_tasks.add_task(self.cache.delete_cache, f'menu_{menu_id}')
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
         return SubmenuResponse.model_validate(submenu)
 
     async def get_submenu(
-            self, menu_id: UUID, submenu_id: UUID
-    ) -> SubmenuResponse | Exception:
-        cache_submenu = await self.cache.get_value(f'submenu_{submenu_id}')
-        if cache_submenu:
-            data_submenu = cache_submenu
-        else:
-            submenu_crud = SubmenuDAL(self.session)
-            submenu = await submenu_crud.get(menu_id, submenu_id)
-            if submenu is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail='submenu not found',
-                )
-            data_submenu = SubmenuResponse.model_validate(submenu)
-            await self.cache.set_key(f'submenu_{submenu_id}', data_submenu)
-        return data_submenu
-
-    async def get_submenus_list(
-            self, menu_id: UUID, offset: int, limit: int
-    ) -> list[SubmenuResponse]:
-        cache_submenu_list = await self.cache.get_value('submenu_list')
-        if cache_submenu_list:
-            data_submenu_list = cache_submenu_list
-        else:
-            submenu_crud = SubmenuDAL(self.session)
-            submenu_list = await submenu_crud.get_list(menu_id, offset, limit)
-            data_submenu_list = [SubmenuResponse.model_validate(submenu) for submenu in submenu_list]
-            await self.cache.set_all('submenu_list', data_submenu_list)
-        return data_submenu_list
+            self, menu_id: UUID, submenu_id: UUID, if_none_match: str | None = None
+    ) -> CacheResult:
+        key = await self.cache.versioned_key(submenu_key(submenu_id), menu_scope(menu_id))
+        return await self.cache.get_or_load(
+            key, lambda: self._load_submenu(menu_id, submenu_id), if_none_match=if_none_match
+        )
 
-    async def update_submenu(
-            self, menu_id: UUID, submenu_id: UUID, submenu_body: dict[str, str], back_tasks: BackgroundTasks
-    ) -> SubmenuResponse | Exception:
+    async def _load_submenu(self, menu_id: UUID, submenu_id: UUID) -> SubmenuResponse:
         submenu_crud = SubmenuDAL(self.session)
         submenu = await submenu_crud.get(menu_id, submenu_id)
         if submenu is None:
@@ -90,16 +86,50 @@ class SubmenuService(SubmenuServiceBase):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail='submenu not found',
             )
+        return SubmenuResponse.model_validate(submenu)
+
+    async def get_submenus_list(
+            self, menu_id: UUID, offset: int, limit: int,
+            cursor: str | None = None, if_none_match: str | None = None
+    ) -> CacheResult:
+        after = decode_cursor(cursor) if cursor is not None else None
+        version = await self.cache.version(menu_scope(menu_id))
+        key = with_version(page_key(submenu_list_key(menu_id), offset, limit, after), version)
+        return await self.cache.get_or_load(
+            key,
+            lambda: self._load_submenus_list(menu_id, offset, limit, after),
+            related=lambda submenus: {
+                with_version(submenu_key(submenu.id), version): submenu for submenu in submenus
+            },
+            if_none_match=if_none_match,
+            cursor=next_cursor(limit),
+        )
+
+    async def _load_submenus_list(
+            self, menu_id: UUID, offset: int, limit: int, after: UUID | None = None
+    ) -> list[SubmenuResponse]:
+        submenu_crud = SubmenuDAL(self.session)
+        submenu_list = await submenu_crud.get_list(menu_id, offset, limit, after)
+        return [SubmenuResponse.model_validate(submenu) for submenu in submenu_list]
+
+    async def update_submenu(
+            self, menu_id: UUID, submenu_id: UUID, submenu_body: dict[str, str]
+    ) -> SubmenuResponse | Exception:
+        submenu_crud = SubmenuDAL(self.session)
         submenu_updated = await submenu_crud.update(
             menu_id, submenu_id, submenu_body
         )
+        if submenu_updated is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='submenu not found',
+            )
         data_submenu_updated = SubmenuResponse.model_validate(submenu_updated)
-        await self.cache.set_key(f'submenu_{submenu_id}', data_submenu_updated)
-        back_tasks.add_task(self.cache.delete_cache, 'submenu_list')
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
         return data_submenu_updated
 
     async def delete_submenu(
-            self, menu_id: UUID, submenu_id: UUID, back_tasks: BackgroundTasks
+            self, menu_id: UUID, submenu_id: UUID
     ) -> UUID | Exception:
         submenu_crud = SubmenuDAL(self.session)
         submenu_deleted_id = await submenu_crud.delete(menu_id, submenu_id)
@@ -108,17 +138,59 @@ class SubmenuService(SubmenuServiceBase):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail='submenu not found',
             )
-        back_tasks.add_task(self.cache.delete_cache, f'submenu_{submenu_deleted_id}')
-        back_tasks.add_task(self.cache.delete_cache, f'menu_{menu_id}')
-        back_tasks.add_task(self.cache.delete_cache, 'menu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'submenu_list')
-        back_tasks.add_task(self.cache.delete_cache, 'dish_list')
-        back_tasks.add_task(self.cache.delete_cache, 'full_menus_submenus_dishes')
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
         return submenu_deleted_id
 
+    async def create_submenus(
+            self, menu_id: UUID, bodies: list[SubmenuCreate]
+    ) -> list[SubmenuResponse]:
+        submenu_crud = SubmenuDAL(self.session)
+        submenus = await submenu_crud.create_many(menu_id, bodies)
+        await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
+        return [SubmenuResponse.model_validate(submenu) for submenu in submenus]
+
+    async def update_submenus(
+            self, menu_id: UUID, bodies: list[dict[str, Any]]
+    ) -> list[BulkResult]:
+        submenu_crud = SubmenuDAL(self.session)
+        updated_ids = await submenu_crud.update_many(menu_id, bodies)
+        if updated_ids:
+            await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
+        return bulk_results([body['id'] for body in bodies], updated_ids,
+                            'The submenu has been updated', 'submenu not found')
+
+    async def delete_submenus(
+            self, menu_id: UUID, submenu_ids: list[UUID]
+    ) -> list[BulkResult]:
+        submenu_crud = SubmenuDAL(self.session)
+        deleted_ids = await submenu_crud.delete_many(menu_id, submenu_ids)
+        if deleted_ids:
+            await self.cache.bump(GLOBAL_SCOPE, menu_scope(menu_id))
+        return bulk_results(submenu_ids, deleted_ids,
+                            'The submenu has been deleted', 'submenu not found')
+
+
+submenu_service: SubmenuService | None = None
+
+
+def init_submenu_service(session: AsyncSession, cache: RedisDB) -> SubmenuService:
+    # One service per worker: session is the scoped-session proxy that the session
+    # dependencies bind to each request, so only a new Redis client replaces it.
+    global submenu_service
+    if submenu_service is None or submenu_service.cache is not cache:
+        submenu_service = SubmenuService(session, cache=cache)
+    return submenu_service
+
 
 def get_submenu_service(
         session: AsyncSession = Depends(db_helper.scoped_session_dependency),
         redis_cache: RedisDB = Depends(get_redis)
 ) -> SubmenuService:
-    return SubmenuService(session, cache=redis_cache)
+    return init_submenu_service(session, redis_cache)
+
+
+def get_submenu_read_service(
+        session: AsyncSession = Depends(db_helper.read_session_dependency),
+        redis_cache: RedisDB = Depends(get_redis)
+) -> SubmenuService:
+    return init_submenu_service(session, redis_cache)
@@ -1,19 +1,20 @@
 import asyncio
 import hashlib
-import json
 from datetime import timedelta
+from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any
-from uuid import uuid4
+from typing import Any, Iterable, Sequence
+from uuid import UUID, uuid5
 
-import pandas as pd
 from celery import Celery
 from openpyxl import load_workbook
-from sqlalchemy import String, create_engine
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Connection, Table, create_engine, delete, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
 
 from src.core.config import settings
-from src.database.redis_cache import RedisDB, get_redis
+from src.database.counters import RECONCILE_COUNTS
+from src.database.models import Dish, Menu, Submenu
+from src.database.redis_cache import RedisDB, create_redis
 
 engine = create_engine(f'postgresql://{settings.db.user}:{settings.db.password.get_secret_value()}@'
                        f'{settings.db.host}:{settings.db.port}/{settings.db.name}')
@@ -25,11 +26,20 @@ celery.conf.beat_schedule = {
         'task': 'tasks.update_database',
         'schedule': timedelta(seconds=15),
     },
+    'reconcile_counts': {
+        'task': 'tasks.reconcile_counts',
+        'schedule': timedelta(hours=1),
+    },
 }
 
 ADMIN_FILE_MENU = Path('src/admin/Menu.xlsx')
 HASH_FILE_MENU = Path('src/admin/hash')
 
+EXCEL_NAMESPACE = UUID('8f9c1b52-3d4e-4b6a-9a0e-2c7d5e1f4a36')
+# Part of the stored hash, so a change in how rows are synced forces one full sync.
+EXCEL_SYNC_VERSION = 2
+PRICE_QUANTUM = Decimal('0.01')
+
 
 def generating_a_hash_amount() -> str:
     with ADMIN_FILE_MENU.open('rb') as file:
@@ -39,7 +49,7 @@ def generating_a_hash_amount() -> str:
             if not data:
                 break
             hsh.update(data)
-    return hsh.hexdigest()
+    return f'{EXCEL_SYNC_VERSION}:{hsh.hexdigest()}'
 
 
 def read_hash() -> str:
@@ -52,73 +62,102 @@ def write_hash(hash_summ: str) -> None:
         f.write(hash_summ)
 
 
-def excel_to_dict(array: list[list]) -> tuple[
-        dict[str, dict[Any, Any]], dict[str, dict[Any, Any]], dict[str, dict[Any, Any]]]:
-    menu_json: dict[str, dict] = {'id': {}, 'title': {}, 'description': {}}
-    submenu_json: dict[str, dict] = {'id': {}, 'menu_id': {}, 'title': {}, 'description': {}}
-    dish_json: dict[str, dict] = {'id': {}, 'submenu_id': {},
-                                  'title': {}, 'description': {}, 'price': {}, 'discount': {}}
+def excel_key(*path: Any) -> str:
+    return '/'.join(str(part) for part in path)
+
+
+def excel_id(*path: Any) -> UUID:
+    return uuid5(EXCEL_NAMESPACE, excel_key(*path))
+
+
+def excel_price(value: Any, row_number: int) -> Decimal:
+    try:
+        price = Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f'Invalid price {value!r} in row {row_number}')
+    if not price.is_finite():
+        raise ValueError(f'Invalid price {value!r} in row {row_number}')
+    return price.quantize(PRICE_QUANTUM)
 
-    menu_count, sub_count, dish_count = 0, 0, 0
 
-    current_menu_id = ''
-    current_sub_id = ''
+def excel_to_rows(array: Iterable[Sequence[Any]]) -> tuple[
+        list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    menus: list[dict[str, Any]] = []
+    submenus: list[dict[str, Any]] = []
+    dishes: list[dict[str, Any]] = []
 
-    for row in array:
+    menu_key: tuple = ()
+    submenu_key: tuple = ()
+
+    for row_number, row in enumerate(array, start=1):
         if bool(row[0]) and bool(row[1]):
-            current_menu_id = str(uuid4())
-            menu_json['id'][menu_count] = current_menu_id
-            menu_json['title'][menu_count] = row[1]
-            menu_json['description'][menu_count] = row[2]
-            menu_count += 1
+            menu_key = ('menu', row[0])
+            menus.append({'id': excel_id(*menu_key), 'excel_key': excel_key(*menu_key),
+                          'title': row[1], 'description': row[2]})
 
         elif bool(row[0]) is False and bool(row[1]):
-            current_sub_id = str(uuid4())
-            submenu_json['id'][sub_count] = current_sub_id
-            submenu_json['menu_id'][sub_count] = current_menu_id
-            submenu_json['title'][sub_count] = row[2]
-            submenu_json['description'][sub_count] = row[3]
-            sub_count += 1
+            submenu_key = (*menu_key, 'submenu', row[1])
+            submenus.append({'id': excel_id(*submenu_key), 'excel_key': excel_key(*submenu_key),
+                             'menu_id': excel_id(*menu_key), 'title': row[2], 'description': row[3]})
 
         elif bool(row[0]) is False and bool(row[1]) is False:
-            dish_json['id'][dish_count] = str(uuid4())
-            dish_json['submenu_id'][dish_count] = current_sub_id
-            dish_json['title'][dish_count] = row[3]
-            dish_json['description'][dish_count] = row[4]
-            dish_json['price'][dish_count] = row[5]
-            dish_count += 1
-    return menu_json, submenu_json, dish_json
-
-
-def run_update_database(data: list) -> None:
-    menus_data, submenus_data, dishes_data = excel_to_dict(data)
-
-    dish_df = pd.read_json(json.dumps(dishes_data))
-    dish_df.to_sql('dish', engine, if_exists='replace', index=False,
-                   dtype={'id': UUID(as_uuid=True),
-                          'submenu_id': UUID(as_uuid=True),
-                          'title': String,
-                          'description': String,
-                          'price': String,
-                          },
-                   )
-
-    submenu_df = pd.read_json(json.dumps(submenus_data))
-    submenu_df.to_sql('submenu', engine, if_exists='replace', index=False,
-                      dtype={'id': UUID(as_uuid=True),
-                             'menu_id': UUID(as_uuid=True),
-                             'title': String,
-                             'description': String,
-                             },
-                      )
-
-    menu_df = pd.read_json(json.dumps(menus_data))
-    menu_df.to_sql('menu', engine, if_exists='replace', index=False,
-                   dtype={'id': UUID(as_uuid=True),
-                          'title': String,
-                          'description': String,
-                          },
-                   )
+            dish_key = (*submenu_key, 'dish', row[2])
+            dishes.append({'id': excel_id(*dish_key), 'excel_key': excel_key(*dish_key),
+                           'submenu_id': excel_id(*submenu_key), 'title': row[3], 'description': row[4],
+                           'price': excel_price(row[5], row_number)})
+    return menus, submenus, dishes
+
+
+def upsert_changed(connection: Connection, table: Table, rows: list[dict[str, Any]]) -> int:
+    if not rows:
+        return 0
+    stmt = insert(table).values(rows)
+    columns = [column for column in rows[0] if column != 'id']
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={column: stmt.excluded[column] for column in columns},
+        where=tuple_(*[table.c[column] for column in columns]).is_distinct_from(
+            tuple_(*[stmt.excluded[column] for column in columns])
+        ),
+    )
+    return connection.execute(stmt).rowcount
+
+
+def delete_missing(connection: Connection, table: Table, rows: list[dict[str, Any]]) -> int:
+    # Only rows with an excel_key come from the workbook; rows created through the API are left alone.
+    stmt = delete(table).where(
+        table.c.excel_key.is_not(None),
+        table.c.excel_key.not_in([row['excel_key'] for row in rows]),
+    )
+    return connection.execute(stmt).rowcount
+
+
+def run_update_database(data: Iterable[Sequence[Any]]) -> int:
+    menus, submenus, dishes = excel_to_rows(data)
+
+    with engine.begin() as connection:
+        changed = 0
+        for table, rows in ((Dish.__table__, dishes), (Submenu.__table__, submenus), (Menu.__table__, menus)):
+            changed += delete_missing(connection, table, rows)
+        for table, rows in ((Menu.__table__, menus), (Submenu.__table__, submenus), (Dish.__table__, dishes)):
+            changed += upsert_changed(connection, table, rows)
+        return changed
+
+
+def run_reconcile_counts() -> int:
+    with engine.begin() as connection:
+        return sum(max(connection.execute(text(statement)).rowcount, 0) for statement in RECONCILE_COUNTS)
+
+
+async def clear_cache(redis: RedisDB) -> None:
+    try:
+        await redis.invalidate_namespace()
+    finally:
+        await redis.close()
+
+
+def run_clear_cache() -> None:
+    asyncio.run(clear_cache(create_redis()))
 
 
 @celery.task
@@ -132,15 +171,17 @@ def update_database() -> None:
         sheet = wb.active
         data = sheet.iter_rows(values_only=True)
         if old_hash != new_hash:
-            run_update_database(data)
+            # The API's NOTIFY listener bumps the touched keys too; clearing here does not depend on it running.
+            if run_update_database(data):
+                run_clear_cache()
             write_hash(new_hash)
-            loop = asyncio.get_event_loop()
-            redis: RedisDB = get_redis()
-            if not loop.is_running():
-                loop.run_until_complete(redis.delete_all())
-                loop.close()
-            else:
-                asyncio.create_task(redis.delete_all())
+
+
+@celery.task
+def reconcile_counts() -> None:
+    if run_reconcile_counts():
+        run_clear_cache()
+
 
 # if __name__ == "__main__":
 #     wb = load_workbook(ADMIN_FILE_MENU)
@@ -0,0 +1,94 @@
+import uuid
+
+from fastapi import status
+from httpx import AsyncClient
+
+from tests.conftest import reverse_url
+
+
+class TestBulk:
+    def setup_class(self):
+        self.menu_id = None
+        self.submenu_id = None
+        self.dish_ids = []
+
+    async def test_create_dishes(
+            self,
+            async_client: AsyncClient,
+            menu_data: dict[str, str],
+            submenu_data: dict[str, str],
+            dish_data: dict[str, str],
+    ) -> None:
+        response_menus = await async_client.post(
+            url=reverse_url('bulk_menus'),
+            json=[menu_data],
+        )
+        assert response_menus.status_code == status.HTTP_201_CREATED
+        self.__class__.menu_id = response_menus.json()[0]['id']
+
+        response_submenus = await async_client.post(
+            url=reverse_url('bulk_submenus', menu_id=self.menu_id),
+            json=[submenu_data],
+        )
+        assert response_submenus.status_code == status.HTTP_201_CREATED
+        self.__class__.submenu_id = response_submenus.json()[0]['id']
+
+        dishes = [dish_data, {**dish_data, 'title': 'title dish 2'}]
+        response_dishes = await async_client.post(
+            url=reverse_url('bulk_dishes', menu_id=self.menu_id, submenu_id=self.submenu_id),
+            json=dishes,
+        )
+        assert response_dishes.status_code == status.HTTP_201_CREATED
+        content_dishes = response_dishes.json()
+        assert [dish['title'] for dish in content_dishes] == [dish['title'] for dish in dishes]
+        self.__class__.dish_ids = [dish['id'] for dish in content_dishes]
+        assert self.dish_ids == sorted(self.dish_ids)
+        assert all(uuid.UUID(dish_id).version == 7 for dish_id in self.dish_ids)
+
+        response_menu = await async_client.get(
+            url=reverse_url('get_menu', menu_id=self.menu_id)
+        )
+        assert response_menu.json()['submenus_count'] == 1
+        assert response_menu.json()['dishes_count'] == 2
+
+    async def test_update_dishes(self, async_client: AsyncClient) -> None:
+        missing_id = str(uuid.uuid4())
+        response = await async_client.patch(
+            url=reverse_url('bulk_dishes', menu_id=self.menu_id, submenu_id=self.submenu_id),
+            json=[
+                {'id': self.dish_ids[0], 'title': 'title updated dish', 'description': None, 'price': None},
+                {'id': missing_id, 'title': 'title updated dish', 'description': None, 'price': None},
+            ],
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [result['status'] for result in response.json()] == [True, False]
+
+        response_dish = await async_client.get(
+            url=reverse_url('get_dish', menu_id=self.menu_id,
+                            submenu_id=self.submenu_id, dish_id=self.dish_ids[0])
+        )
+        assert response_dish.json()['title'] == 'title updated dish'
+        assert response_dish.json()['price'] == '77.77'
+
+    async def test_delete_dishes(self, async_client: AsyncClient) -> None:
+        response = await async_client.request(
+            'DELETE',
+            url=reverse_url('bulk_dishes', menu_id=self.menu_id, submenu_id=self.submenu_id),
+            json=self.dish_ids,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [result['status'] for result in response.json()] == [True, True]
+
+        response_submenu = await async_client.get(
+            url=reverse_url('get_submenu', menu_id=self.menu_id, submenu_id=self.submenu_id)
+        )
+        assert response_submenu.json()['dishes_count'] == 0
+
+    async def test_delete_menus(self, async_client: AsyncClient) -> None:
+        response = await async_client.request(
+            'DELETE',
+            url=reverse_url('bulk_menus'),
+            json=[self.menu_id],
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]['message'] == 'The menu has been deleted'
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from src.database.codecs import CODECS, dump_json, get_codec
+from src.database.redis_cache import RAW_ENTRY_CODEC, as_entry
+from src.database.single_flight import SingleFlight
+from src.schemas.menu import MenuResponse
+from src.service.pagination import encode_cursor, next_cursor
+from tests.conftest import create_test_redis
+
+
+def counting_loader(value: Any, delay: float = 0.1) -> tuple[dict[str, int], Any]:
+    calls = {'count': 0}
+
+    async def load() -> Any:
+        calls['count'] += 1
+        await asyncio.sleep(delay)
+        return value
+
+    return calls, load
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_load(self) -> None:
+        single_flight = SingleFlight()
+        calls, load = counting_loader('value')
+
+        results = await asyncio.gather(*[single_flight.do('key', load) for _ in range(10)])
+
+        assert results == ['value'] * 10
+        assert calls['count'] == 1
+        assert single_flight.calls == {}
+
+    async def test_error_reaches_every_caller(self) -> None:
+        single_flight = SingleFlight()
+
+        async def load() -> None:
+            await asyncio.sleep(0.1)
+            raise ValueError('load failed')
+
+        results = await asyncio.gather(*[single_flight.do('key', load) for _ in range(3)],
+                                       return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert single_flight.calls == {}
+
+    async def test_follower_takes_over_cancelled_leader(self) -> None:
+        single_flight = SingleFlight()
+        calls, load = counting_loader('value')
+
+        leader = asyncio.create_task(single_flight.do('key', load))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.create_task(single_flight.do('key', load)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await asyncio.gather(*followers) == ['value', 'value']
+        assert calls['count'] == 2
+
+
+class TestDistributedLock:
+    async def test_workers_share_one_load(self) -> None:
+        workers = [create_test_redis(), create_test_redis()]
+        key = f'lock_test_{uuid4()}'
+        calls, load = counting_loader({'title': 'menu'}, delay=0.3)
+
+        results = await asyncio.gather(*[worker.get_or_load(key, load) for worker in workers])
+
+        assert [result.value for result in results] == [{'title': 'menu'}] * 2
+        assert calls['count'] == 1
+        for worker in workers:
+            await worker.close()
+
+    async def test_waiter_loads_after_holder_fails(self) -> None:
+        holder, waiter = create_test_redis(), create_test_redis()
+        key = f'lock_test_{uuid4()}'
+
+        async def failing_load() -> None:
+            await asyncio.sleep(0.1)
+            raise ValueError('load failed')
+
+        calls, load = counting_loader({'title': 'menu'}, delay=0)
+        started = time.monotonic()
+        holder_task = asyncio.create_task(holder.get_or_load(key, failing_load))
+        await asyncio.sleep(0.02)
+        result = await waiter.get_or_load(key, load)
+
+        assert result.value == {'title': 'menu'}
+        assert calls['count'] == 1
+        assert time.monotonic() - started < waiter.lock_timeout
+        with pytest.raises(ValueError):
+            await holder_task
+        await holder.close()
+        await waiter.close()
+
+
+class TestStaleWhileRevalidate:
+    async def test_stale_entry_is_served_while_refreshing(self) -> None:
+        redis = create_test_redis(soft_ttls={'menu_list': 0.0})
+        key = f'swr_test_{uuid4()}'
+        _, load = counting_loader(['stale'], delay=0)
+        calls, refresh = counting_loader(['fresh'], delay=0.1)
+
+        first = await redis.get_or_load(key, load, policy='menu_list', refresher=refresh)
+        stale = await redis.get_or_load(key, load, policy='menu_list', refresher=refresh)
+        assert first.value == stale.value == ['stale']
+        assert list(redis.refresh_tasks) == [key]
+
+        await asyncio.gather(*redis.refresh_tasks.values())
+        fresh = await redis.get_or_load(key, load, policy='menu_list', refresher=refresh)
+        assert fresh.value == ['fresh']
+        assert calls['count'] == 1
+        await asyncio.gather(*redis.refresh_tasks.values())
+        await redis.close()
+
+    async def test_failed_refresh_is_logged(self, caplog: pytest.LogCaptureFixture) -> None:
+        redis = create_test_redis(soft_ttls={'menu_list': 0.0})
+        key = f'swr_test_{uuid4()}'
+        _, load = counting_loader(['stale'], delay=0)
+
+        async def failing_refresh() -> None:
+            raise ValueError('refresh failed')
+
+        await redis.get_or_load(key, load, policy='menu_list', refresher=failing_refresh)
+        stale = await redis.get_or_load(key, load, policy='menu_list', refresher=failing_refresh)
+        await asyncio.gather(*redis.refresh_tasks.values(), return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert stale.value == ['stale']
+        assert any(record.exc_info and record.exc_info[0] is ValueError for record in caplog.records)
+        await redis.close()
+
+    async def test_entry_without_policy_is_not_refreshed(self) -> None:
+        redis = create_test_redis(soft_ttls={'menu_list': 0.0})
+        key = f'swr_test_{uuid4()}'
+        _, load = counting_loader(['value'], delay=0)
+        calls, refresh = counting_loader(['fresh'], delay=0)
+
+        await redis.get_or_load(key, load, refresher=refresh)
+        await redis.get_or_load(key, load, refresher=refresh)
+
+        assert redis.refresh_tasks == {}
+        assert calls['count'] == 0
+        await redis.close()
+
+
+class TestCodecs:
+    @pytest.mark.parametrize('codec_name', CODECS)
+    def test_round_trip(self, codec_name: str) -> None:
+        codec = get_codec(codec_name)
+        menu = MenuResponse(id=uuid4(), title='menu', description='description', submenus_count=1, dishes_count=2)
+
+        decoded = codec.decode(codec.encode({'value': [menu], 'loaded_at': 1.5, 'refresh_at': None}))
+
+        assert decoded == {'value': [{**menu.model_dump(), 'id': str(menu.id)}], 'loaded_at': 1.5, 'refresh_at': None}
+
+    def test_raw_entry_round_trip(self) -> None:
+        entry = {'value': b'[{"title": "menu"}]', 'next_cursor': 'AZ', 'loaded_at': 1.5, 'refresh_at': None}
+
+        assert RAW_ENTRY_CODEC.decode(RAW_ENTRY_CODEC.encode(entry)) == entry
+
+    @pytest.mark.parametrize('raw', [False, True])
+    async def test_entry_cursor(self, raw: bool) -> None:
+        menus = [MenuResponse(id=uuid4(), title='menu', description='description', submenus_count=0, dishes_count=0)
+                 for _ in range(2)]
+        _, load = counting_loader(menus, delay=0)
+
+        entry = await as_entry(load, None, raw=raw, cursor=next_cursor(2))()
+
+        assert entry['next_cursor'] == encode_cursor(menus[-1].id)
+
+    @pytest.mark.parametrize('codec_name', CODECS)
+    async def test_cache_with_codec(self, codec_name: str) -> None:
+        redis = create_test_redis(codec=get_codec(codec_name))
+        scope = f'codec_test_{uuid4()}'
+        key = f'codec_test_{uuid4()}'
+        _, load = counting_loader([{'title': 'menu'}], delay=0)
+
+        version = await redis.version(scope)
+        await redis.bump(scope)
+        assert await redis.version(scope) != version
+
+        assert (await redis.get_or_load(key, load)).value == [{'title': 'menu'}]
+        raw = await redis.get_or_load(f'{key}_raw', load, raw=True)
+        assert raw.value == dump_json([{'title': 'menu'}]).encode()
+        await redis.close()
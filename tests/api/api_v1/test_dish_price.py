@@ -0,0 +1,46 @@
+from fastapi import status
+from httpx import AsyncClient
+
+from tests.conftest import create_menu_tree, reverse_url
+
+
+class TestDishPrice:
+    def setup_class(self):
+        self.menu_id = None
+        self.submenu_id = None
+
+    async def test_create_menu_tree(
+            self,
+            async_client: AsyncClient,
+            menu_data: dict[str, str],
+            submenu_data: dict[str, str],
+            dish_data: dict[str, str],
+    ) -> None:
+        self.__class__.menu_id, self.__class__.submenu_id = await create_menu_tree(
+            async_client, menu_data, submenu_data, dish_data
+        )
+
+    async def test_get_dishes_price_filter(self, async_client: AsyncClient) -> None:
+        url = reverse_url('get_dishes', menu_id=self.menu_id, submenu_id=self.submenu_id)
+        response_filtered = await async_client.get(url=url, params={'min_price': '60', 'max_price': '80'})
+        assert response_filtered.status_code == status.HTTP_200_OK
+        assert [dish['price'] for dish in response_filtered.json()] == ['77.77']
+
+    async def test_get_dishes_price_sort(self, async_client: AsyncClient) -> None:
+        url = reverse_url('get_dishes', menu_id=self.menu_id, submenu_id=self.submenu_id)
+        response_desc = await async_client.get(url=url, params={'sort': '-price'})
+        assert response_desc.status_code == status.HTTP_200_OK
+        assert [dish['price'] for dish in response_desc.json()] == ['77.77', '55.50']
+
+    async def test_get_dishes_price_cursor(self, async_client: AsyncClient) -> None:
+        url = reverse_url('get_dishes', menu_id=self.menu_id, submenu_id=self.submenu_id)
+        response_first_page = await async_client.get(url=url, params={'sort': 'price', 'limit': 1})
+        assert [dish['price'] for dish in response_first_page.json()] == ['55.50']
+        response_second_page = await async_client.get(
+            url=url, params={'sort': 'price', 'limit': 1, 'cursor': response_first_page.headers['X-Next-Cursor']}
+        )
+        assert [dish['price'] for dish in response_second_page.json()] == ['77.77']
+
+        id_cursor = (await async_client.get(url=url, params={'limit': 1})).headers['X-Next-Cursor']
+        response_id_cursor = await async_client.get(url=url, params={'sort': 'price', 'cursor': id_cursor})
+        assert response_id_cursor.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,70 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.pool import NullPool
+
+import tasks
+from src.core.config import settings
+from src.database.ids import uuid7
+from src.database.models import Dish, Menu
+
+sync_engine = create_engine(settings.db_test.async_url.replace('+asyncpg', '', 1), poolclass=NullPool)
+
+WORKBOOK = [
+    (1, 'title menu 1', 'description menu 1', None, None, None),
+    (None, 1, 'title submenu 1', 'description submenu 1', None, None),
+    (None, None, 1, 'title dish 1', 'description dish 1', 10.5),
+    (None, None, 2, 'title dish 2', 'description dish 2', '20'),
+]
+
+
+@pytest.fixture(autouse=True)
+def excel_engine(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tasks, 'engine', sync_engine)
+
+
+def dish_prices() -> dict[str, Decimal]:
+    with sync_engine.connect() as connection:
+        return dict(connection.execute(select(Dish.title, Dish.price)).all())
+
+
+class TestExcelSync:
+    def test_sync_workbook(self) -> None:
+        assert tasks.run_update_database(WORKBOOK) == 4
+        assert dish_prices() == {'title dish 1': Decimal('10.50'), 'title dish 2': Decimal('20.00')}
+
+    def test_sync_unchanged_workbook(self) -> None:
+        assert tasks.run_update_database(WORKBOOK) == 0
+
+    def test_sync_price_edit(self) -> None:
+        workbook = [*WORKBOOK[:3], (None, None, 2, 'title dish 2', 'description dish 2', '25.99')]
+        assert tasks.run_update_database(workbook) == 1
+        assert dish_prices()['title dish 2'] == Decimal('25.99')
+
+    def test_sync_removed_dish(self) -> None:
+        assert tasks.run_update_database(WORKBOOK[:3]) == 1
+        assert list(dish_prices()) == ['title dish 1']
+
+    def test_sync_replaces_legacy_rows(self) -> None:
+        with sync_engine.begin() as connection:
+            menu_id = uuid4()
+            connection.execute(insert(Menu).values(id=menu_id, excel_key=f'legacy/{menu_id}',
+                                                   title='title legacy menu', description='description legacy menu'))
+        assert tasks.run_update_database(WORKBOOK[:3]) == 1
+        with sync_engine.connect() as connection:
+            assert connection.execute(select(Menu.id).where(Menu.id == menu_id)).first() is None
+
+    def test_sync_keeps_api_rows(self) -> None:
+        submenu_id = tasks.excel_id('menu', 1, 'submenu', 1)
+        with sync_engine.begin() as connection:
+            connection.execute(insert(Dish).values(id=uuid7(), submenu_id=submenu_id, title='title api dish',
+                                                   description='description api dish', price=Decimal('5.00')))
+        assert tasks.run_update_database(WORKBOOK[:3]) == 0
+        assert 'title api dish' in dish_prices()
+
+    def test_sync_invalid_price(self) -> None:
+        workbook = [*WORKBOOK[:3], (None, None, 2, 'title dish 2', 'description dish 2', 'twenty')]
+        with pytest.raises(ValueError, match='row 4'):
+            tasks.run_update_database(workbook)
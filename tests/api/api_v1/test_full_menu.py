@@ -0,0 +1,46 @@
+import json
+
+from fastapi import status
+from httpx import AsyncClient
+
+from tests.conftest import create_menu_tree, reverse_url
+
+
+class TestFullMenu:
+    def setup_class(self):
+        self.menu_id = None
+        self.submenu_id = None
+
+    async def test_create_menu_tree(
+            self,
+            async_client: AsyncClient,
+            menu_data: dict[str, str],
+            submenu_data: dict[str, str],
+            dish_data: dict[str, str],
+    ) -> None:
+        self.__class__.menu_id, self.__class__.submenu_id = await create_menu_tree(
+            async_client, menu_data, submenu_data, dish_data
+        )
+
+    async def test_get_full_menus_submenus_dishes(self, async_client: AsyncClient) -> None:
+        response = await async_client.get(url=reverse_url('full_menus_submenus_dishes'))
+        assert response.status_code == status.HTTP_200_OK
+        content = response.json()
+
+        menu = next(menu for menu in content if menu['id'] == self.menu_id)
+        assert len(menu['submenus']) == 1
+        assert menu['submenus'][0]['id'] == self.submenu_id
+        assert {dish['price'] for dish in menu['submenus'][0]['dishes']} == {'77.77', '55.50'}
+
+    async def test_stream_full_menus_submenus_dishes(self, async_client: AsyncClient) -> None:
+        url = reverse_url('stream_full_menus_submenus_dishes')
+        response_ndjson = await async_client.get(url=url)
+        assert response_ndjson.status_code == status.HTTP_200_OK
+        assert response_ndjson.headers['content-type'].startswith('application/x-ndjson')
+        response_json = await async_client.get(url=url, params={'format': 'json'})
+        assert response_json.status_code == status.HTTP_200_OK
+
+        menus = [json.loads(line) for line in response_ndjson.text.splitlines()]
+        assert menus == response_json.json()
+        menu = next(menu for menu in menus if menu['id'] == self.menu_id)
+        assert len(menu['submenus'][0]['dishes']) == 2
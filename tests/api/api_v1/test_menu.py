@@ -18,6 +18,7 @@ class TestMenu:
         response = await async_client.post(url=reverse_url('create_menu'),
                                            json=menu_data)
         assert response.status_code == status.HTTP_201_CREATED
+        assert 'X-Consistency-Token' in response.headers
 
         content: dict[str, str] = response.json()
         self.__class__.id = content['id']
@@ -42,6 +43,19 @@ class TestMenu:
         assert 'dishes_count' in content
         assert 'id' in content
 
+    async def test_get_menu_not_modified(self, async_client: AsyncClient) -> None:
+        response = await async_client.get(url=reverse_url('get_menu',
+                                                          menu_id=self.id))
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers['etag']
+        assert 'last-modified' in response.headers
+
+        response = await async_client.get(url=reverse_url('get_menu',
+                                                          menu_id=self.id),
+                                          headers={'If-None-Match': etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers['etag'] == etag
+
     async def test_get_menu_not_found(self, async_client: AsyncClient) -> None:
         menu_id = uuid.uuid4()
         response = await async_client.get(url=reverse_url('get_menu',
@@ -51,6 +65,11 @@ class TestMenu:
         content = response.json()
         assert content['detail'] == 'menu not found'
 
+        response = await async_client.get(url=reverse_url('get_menu',
+                                                          menu_id=menu_id),
+                                          headers={'If-None-Match': '*'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     async def test_update_menu(
             self, async_client: AsyncClient, update_menu_data: dict[str, str]
     ) -> None:
@@ -68,6 +87,11 @@ class TestMenu:
         assert content['title'] != self.title
         assert content['description'] != self.description
 
+        response = await async_client.get(url=reverse_url('get_menu',
+                                                          menu_id=self.id))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['title'] == update_menu_data['title']
+
         self.title = content['title']
         self.description = content['description']
 
@@ -0,0 +1,27 @@
+import json
+
+from src.database.ids import uuid7
+from src.database.notify import apply_changes
+from src.database.redis_cache import GLOBAL_SCOPE, menu_scope, submenu_scope
+from tests.conftest import redis_test
+
+
+class TestApplyChanges:
+    async def test_row_change_bumps_its_scopes(self) -> None:
+        menu_id, submenu_id = uuid7(), uuid7()
+        scopes = [GLOBAL_SCOPE, menu_scope(menu_id), submenu_scope(submenu_id)]
+        versions = [await redis_test.version(scope) for scope in scopes]
+        change = {'table': 'dish', 'id': str(uuid7()), 'menu_id': str(menu_id), 'submenu_id': str(submenu_id)}
+
+        await apply_changes(redis_test, [json.dumps(change)])
+
+        assert all([await redis_test.version(scope) != version for scope, version in zip(scopes, versions)])
+
+    async def test_unrelated_scope_is_kept(self) -> None:
+        scope = menu_scope(uuid7())
+        version = await redis_test.version(scope)
+        change = {'table': 'dish', 'id': str(uuid7()), 'menu_id': str(uuid7()), 'submenu_id': str(uuid7())}
+
+        await apply_changes(redis_test, [json.dumps(change)])
+
+        assert await redis_test.version(scope) == version
@@ -0,0 +1,89 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.core.config import settings
+from tests.conftest import reverse_url
+
+
+class TestPagination:
+    def setup_class(self):
+        self.menu_ids = []
+        self.menu_id = None
+        self.submenu_id = None
+
+    async def test_create_menus(
+            self,
+            async_client: AsyncClient,
+            menu_data: dict[str, str],
+            submenu_data: dict[str, str],
+            dish_data: dict[str, str],
+    ) -> None:
+        for number in range(3):
+            response_menu = await async_client.post(
+                url=reverse_url('create_menu'),
+                json={**menu_data, 'title': f'title menu {number}'},
+            )
+            assert response_menu.status_code == status.HTTP_201_CREATED
+            self.__class__.menu_ids = [*self.menu_ids, response_menu.json()['id']]
+        self.__class__.menu_id = self.menu_ids[0]
+
+        response_submenu = await async_client.post(
+            url=reverse_url('create_submenu', menu_id=self.menu_id),
+            json=submenu_data,
+        )
+        assert response_submenu.status_code == status.HTTP_201_CREATED
+        self.__class__.submenu_id = response_submenu.json()['id']
+
+        for dish in (dish_data, {**dish_data, 'title': 'title dish 2', 'price': '55.50'}):
+            response_dish = await async_client.post(
+                url=reverse_url('create_dish', menu_id=self.menu_id, submenu_id=self.submenu_id),
+                json=dish,
+            )
+            assert response_dish.status_code == status.HTTP_201_CREATED
+
+    async def test_get_menus_cursor_raw(self, async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings.redis, 'raw_responses', True)
+        url = reverse_url('get_menus')
+        response_first_page = await async_client.get(url=url, params={'limit': 2})
+        assert response_first_page.status_code == status.HTTP_200_OK
+        cursor = response_first_page.headers['X-Next-Cursor']
+
+        response_second_page = await async_client.get(url=url, params={'limit': 2, 'cursor': cursor})
+        assert response_second_page.status_code == status.HTTP_200_OK
+        assert 'X-Next-Cursor' not in response_second_page.headers
+
+        assert [menu['id'] for menu in response_first_page.json()] == self.menu_ids[:2]
+        assert [menu['id'] for menu in response_second_page.json()] == self.menu_ids[2:]
+
+    async def test_get_dishes_pages(self, async_client: AsyncClient) -> None:
+        url = reverse_url('get_dishes',
+                          menu_id=self.menu_id,
+                          submenu_id=self.submenu_id)
+        response_first_page = await async_client.get(url=url, params={'offset': 0, 'limit': 1})
+        assert response_first_page.status_code == status.HTTP_200_OK
+        response_second_page = await async_client.get(url=url, params={'offset': 1, 'limit': 1})
+        assert response_second_page.status_code == status.HTTP_200_OK
+
+        content_first_page = response_first_page.json()
+        content_second_page = response_second_page.json()
+        assert len(content_first_page) == 1
+        assert len(content_second_page) == 1
+        assert content_first_page[0]['id'] != content_second_page[0]['id']
+
+    async def test_get_dishes_cursor(self, async_client: AsyncClient) -> None:
+        url = reverse_url('get_dishes',
+                          menu_id=self.menu_id,
+                          submenu_id=self.submenu_id)
+        response_first_page = await async_client.get(url=url, params={'limit': 1})
+        assert response_first_page.status_code == status.HTTP_200_OK
+        cursor = response_first_page.headers['X-Next-Cursor']
+        response_second_page = await async_client.get(url=url, params={'limit': 1, 'cursor': cursor})
+        assert response_second_page.status_code == status.HTTP_200_OK
+        response_invalid = await async_client.get(url=url, params={'cursor': '!'})
+        assert response_invalid.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        content_first_page = response_first_page.json()
+        content_second_page = response_second_page.json()
+        assert len(content_second_page) == 1
+        assert content_first_page[0]['id'] < content_second_page[0]['id']
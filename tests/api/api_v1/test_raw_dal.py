@@ -0,0 +1,41 @@
+from uuid import UUID
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.dish import DishDAL
+from src.crud.menu import MenuDAL
+from src.crud.raw import DishRawDAL, MenuRawDAL
+from src.schemas.dish import DishResponse
+from src.schemas.menu import MenuResponse
+from tests.conftest import create_menu_tree
+
+
+class TestRawDAL:
+    def setup_class(self):
+        self.menu_id = None
+        self.submenu_id = None
+
+    async def test_create_menu_tree(
+            self,
+            async_client: AsyncClient,
+            menu_data: dict[str, str],
+            submenu_data: dict[str, str],
+            dish_data: dict[str, str],
+    ) -> None:
+        self.__class__.menu_id, self.__class__.submenu_id = await create_menu_tree(
+            async_client, menu_data, submenu_data, dish_data
+        )
+
+    async def test_raw_dal_matches_orm(self, db: AsyncSession) -> None:
+        menu_id = UUID(self.menu_id)
+        submenu_id = UUID(self.submenu_id)
+
+        menu = await MenuRawDAL(db).get(menu_id)
+        assert MenuResponse.model_validate(menu) == MenuResponse.model_validate(await MenuDAL(db).get(menu_id))
+        menus = await MenuRawDAL(db).get_list(0, 50)
+        assert [row['id'] for row in menus] == [row.id for row in await MenuDAL(db).get_list(0, 50)]
+        dishes = await DishRawDAL(db).get_list(submenu_id, 0, 50)
+        assert [DishResponse.model_validate(dish) for dish in dishes] == [
+            DishResponse.model_validate(dish) for dish in await DishDAL(db).get_list(submenu_id, 0, 50)
+        ]
@@ -0,0 +1,35 @@
+from fastapi import status
+from httpx import AsyncClient
+
+from tests.conftest import create_menu_tree, reverse_url
+
+
+class TestSearch:
+    def setup_class(self):
+        self.menu_id = None
+        self.submenu_id = None
+
+    async def test_create_menu_tree(
+            self,
+            async_client: AsyncClient,
+            menu_data: dict[str, str],
+            submenu_data: dict[str, str],
+            dish_data: dict[str, str],
+    ) -> None:
+        self.__class__.menu_id, self.__class__.submenu_id = await create_menu_tree(
+            async_client, menu_data, submenu_data, dish_data
+        )
+
+    async def test_search(self, async_client: AsyncClient) -> None:
+        response = await async_client.get(url=reverse_url('search'), params={'q': 'dish 2'})
+        assert response.status_code == status.HTTP_200_OK
+        content = response.json()
+
+        assert content[0]['type'] == 'dish'
+        assert content[0]['title'] == 'title dish 2'
+        assert content[0]['submenu_id'] == self.submenu_id
+        assert content[0]['menu_id'] == self.menu_id
+
+    async def test_search_empty_phrase(self, async_client: AsyncClient) -> None:
+        response = await async_client.get(url=reverse_url('search'), params={'q': ''})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -1,10 +1,11 @@
 import asyncio
 from asyncio import current_task
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 from uuid import UUID
 
 import backoff
 import pytest
+from fastapi import status
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -16,6 +17,8 @@ from sqlalchemy.pool import StaticPool
 
 from main import app
 from src.core.config import settings
+from src.database.codecs import get_codec
+from src.database.local_cache import LocalCache
 from src.database.models import Base
 from src.database.redis_cache import RedisDB, get_redis
 from src.database.session import db_helper
@@ -35,28 +38,45 @@ Base.metadata.bind = async_engine
 
 
 async def override_scoped_session_dependency():
-    scoped_factory = async_scoped_session(
-        async_session_factory,
-        scopefunc=current_task,
-    )
-    try:
-        async with scoped_factory() as session:
-            yield session
-    finally:
-        await scoped_factory.remove()
+    async with db_helper.bind(async_session_factory) as session:
+        yield session
+
+
+def create_test_redis(**options: Any) -> RedisDB:
+    # Same tiers as create_redis(): local cache, codec, soft TTLs and the load lock.
+    defaults: dict[str, Any] = {
+        'local_cache': LocalCache(max_size=settings.redis.local_cache_size,
+                                  ttl=settings.redis.local_cache_ttl,
+                                  max_bytes=settings.redis.local_cache_max_bytes),
+        'lock_timeout': 2.0,
+        'soft_ttls': settings.redis.stale_while_revalidate,
+        'codec': get_codec(settings.redis.codec),
+        'prefix': 'test',
+    }
+    return RedisDB(host=settings.redis_test.host,
+                   port=settings.redis_test.port,
+                   password=settings.redis_test.password.get_secret_value(),
+                   expire_in_sec=settings.redis_test.expire_in_sec,
+                   **{**defaults, **options})
+
+
+redis_test = create_test_redis()
 
 
 @backoff.on_exception(backoff.expo, ConnectionError, max_tries=5, raise_on_giveup=True)
 async def override_get_redis() -> RedisDB:
-    return RedisDB(host=settings.redis_test.host,
-                   port=settings.redis_test.port,
-                   password=settings.redis_test.password.get_secret_value(),
-                   expire_in_sec=settings.redis_test.expire_in_sec)
+    return redis_test
 
 
 app.dependency_overrides[
     db_helper.scoped_session_dependency
 ] = override_scoped_session_dependency
+app.dependency_overrides[
+    db_helper.read_session_dependency
+] = override_scoped_session_dependency
+app.dependency_overrides[
+    db_helper.read_sessionmaker_dependency
+] = lambda: async_session_factory
 app.dependency_overrides[get_redis] = override_get_redis
 
 
@@ -150,6 +170,31 @@ async def update_dish_data() -> dict[str, str]:
     }
 
 
+async def create_menu_tree(
+        async_client: AsyncClient,
+        menu_data: dict[str, str],
+        submenu_data: dict[str, str],
+        dish_data: dict[str, str],
+) -> tuple[str, str]:
+    # One menu with one submenu and two dishes priced 77.77 and 55.50.
+    response_menu = await async_client.post(url=reverse_url('create_menu'), json=menu_data)
+    assert response_menu.status_code == status.HTTP_201_CREATED
+    menu_id = response_menu.json()['id']
+
+    response_submenu = await async_client.post(url=reverse_url('create_submenu', menu_id=menu_id),
+                                               json=submenu_data)
+    assert response_submenu.status_code == status.HTTP_201_CREATED
+    submenu_id = response_submenu.json()['id']
+
+    dish_data_2 = {'title': 'title dish 2', 'description': 'description dish 2', 'price': '55.50'}
+    for dish in (dish_data, dish_data_2):
+        response_dish = await async_client.post(
+            url=reverse_url('create_dish', menu_id=menu_id, submenu_id=submenu_id), json=dish
+        )
+        assert response_dish.status_code == status.HTTP_201_CREATED
+    return menu_id, submenu_id
+
+
 def reverse_url(route_name: str, **kwargs: UUID) -> str:
     routes = {
         'get_menus': '/menus',
@@ -170,6 +215,12 @@ def reverse_url(route_name: str, **kwargs: UUID) -> str:
                        f'{kwargs.get("submenu_id", "")}/dishes/{kwargs.get("dish_id", "")}',
         'delete_dish': f'/menus/{kwargs.get("menu_id", "")}/submenus/'
                        f'{kwargs.get("submenu_id", "")}/dishes/{kwargs.get("dish_id", "")}',
+        'full_menus_submenus_dishes': '/full_menus_submenus_dishes',
+        'stream_full_menus_submenus_dishes': '/full_menus_submenus_dishes/stream',
+        'search': '/search',
+        'bulk_menus': '/menus/bulk',
+        'bulk_submenus': f'/menus/{kwargs.get("menu_id", "")}/submenus/bulk',
+        'bulk_dishes': f'/menus/{kwargs.get("menu_id", "")}/submenus/{kwargs.get("submenu_id", "")}/dishes/bulk',
     }
 
     return str(routes.get(route_name))